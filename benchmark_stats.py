@@ -0,0 +1,54 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from parallel_stats import parallel_summarize_csv
+from streaming_stats import describe_summaries, summarize_csv
+
+# Function to write a synthetic CSV with numeric columns and one text column
+def make_csv(file_path, rows, columns, chunk_rows=500_000):
+    rng = np.random.default_rng(42)
+    for start in range(0, rows, chunk_rows):
+        size = min(chunk_rows, rows - start)
+        chunk = pd.DataFrame(rng.normal(size=(size, columns)), columns=[f"col_{i}" for i in range(columns)])
+        chunk["label"] = rng.choice(["a", "b", "c"], size=size)
+        chunk.to_csv(file_path, mode="a" if start else "w", header=not start, index=False)
+
+# Function to time a callable and return (seconds, result)
+def timed(function, *args, **kwargs):
+    started = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare pandas describe() with the streaming and parallel statistics engines.")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--file", help="Existing CSV to benchmark instead of a synthetic one")
+    args = parser.parse_args()
+
+    file_path = args.file
+    if not file_path:
+        file_path = os.path.join(tempfile.gettempdir(), f"benchmark_{args.rows}x{args.columns}.csv")
+        if not os.path.exists(file_path):
+            print(f"Writing {args.rows} x {args.columns} synthetic CSV to {file_path}")
+            make_csv(file_path, args.rows, args.columns)
+
+    pandas_seconds, _ = timed(lambda: pd.read_csv(file_path).describe())
+    print(f"pandas read_csv + describe: {pandas_seconds:.2f}s")
+
+    streaming_seconds, _ = timed(summarize_csv, file_path)
+    print(f"streaming (1 process):      {streaming_seconds:.2f}s")
+
+    parallel_seconds, (summaries, _) = timed(parallel_summarize_csv, file_path, workers=args.workers)
+    print(f"parallel ({args.workers} processes):     {parallel_seconds:.2f}s "
+          f"({streaming_seconds / parallel_seconds:.1f}x vs streaming, {pandas_seconds / parallel_seconds:.1f}x vs pandas)")
+    print(describe_summaries(summaries).iloc[:, :5].to_string())
+
+if __name__ == "__main__":
+    main()
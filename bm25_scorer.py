@@ -0,0 +1,179 @@
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# Default weight of each resume section in the BM25F pseudo term frequency
+SECTION_WEIGHTS = {
+    "skills": 3.0,
+    "experience": 2.0,
+    "projects": 1.5,
+    "other": 1.0,
+}
+
+# Headings that start a new section when they appear on a line of their own
+SECTION_HEADINGS = {
+    "skills": ("skills", "technical skills", "key skills", "core competencies", "technologies"),
+    "experience": ("experience", "work experience", "professional experience", "employment history"),
+    "projects": ("projects", "key projects", "project details", "academic projects"),
+}
+
+# Keeps tokens such as "c++", "c#" and "node.js" intact; letters of any script count as word
+# characters, so accented words such as "développeur" or "Straße" are not split
+TOKEN_PATTERN = re.compile(r"[^\W_][\w+#.]*[\w+#]|[^\W_]")
+
+_HEADING_TO_SECTION = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+
+
+# Function to split text into lower-case tokens without stop words
+def tokenize(text, stop_words=ENGLISH_STOP_WORDS):
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in stop_words]
+
+
+# Function to split a resume into the sections used by BM25F
+def split_sections(text):
+    sections = defaultdict(list)
+    current = "other"
+    for line in text.splitlines():
+        heading = line.strip().strip(":").strip().lower()
+        if heading in _HEADING_TO_SECTION:
+            current = _HEADING_TO_SECTION[heading]
+            continue
+        sections[current].append(line)
+    return {section: "\n".join(lines) for section, lines in sections.items()}
+
+
+class BM25FIndex:
+    """Inverted index over resumes scored with field-weighted BM25 (BM25F).
+
+    Every posting stores the document's precomputed, saturated term score, so a
+    query only has to add up posting scores. Posting lists are sorted by
+    document id and ``search`` uses MaxScore early termination to skip
+    documents that cannot enter the top-k.
+    """
+
+    def __init__(self, documents, section_weights=None, k1=1.2, b=0.75, stop_words=ENGLISH_STOP_WORDS):
+        self.section_weights = dict(section_weights or SECTION_WEIGHTS)
+        self.k1 = k1
+        self.b = b
+        self.stop_words = stop_words
+        self.doc_count = 0
+        self.postings = {}  # term -> (doc ids, scores)
+        self.max_scores = {}  # term -> highest score in the posting list
+        self._build(documents)
+
+    def _build(self, documents):
+        # Section term frequencies and lengths per document
+        section_tfs = []
+        section_lengths = defaultdict(list)
+        for text in documents:
+            doc_tfs = {}
+            for section, section_text in split_sections(text).items():
+                if section not in self.section_weights:
+                    section = "other"
+                tokens = tokenize(section_text, self.stop_words)
+                doc_tfs.setdefault(section, Counter()).update(tokens)
+            for section in self.section_weights:
+                section_lengths[section].append(sum(doc_tfs.get(section, Counter()).values()))
+            section_tfs.append(doc_tfs)
+        self.doc_count = len(section_tfs)
+        average_lengths = {
+            section: (sum(lengths) / len(lengths)) or 1.0 for section, lengths in section_lengths.items()
+        }
+
+        # Length-normalised, weighted pseudo frequency of each term per document
+        pseudo_tfs = defaultdict(dict)
+        for doc_id, doc_tfs in enumerate(section_tfs):
+            for section, counts in doc_tfs.items():
+                length = section_lengths[section][doc_id]
+                norm = 1 - self.b + self.b * length / average_lengths[section]
+                weight = self.section_weights[section]
+                for term, count in counts.items():
+                    doc_terms = pseudo_tfs[term]
+                    doc_terms[doc_id] = doc_terms.get(doc_id, 0.0) + weight * count / norm
+
+        for term, doc_terms in pseudo_tfs.items():
+            df = len(doc_terms)
+            idf = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+            doc_ids = sorted(doc_terms)
+            scores = [idf * doc_terms[d] / (self.k1 + doc_terms[d]) for d in doc_ids]
+            self.postings[term] = (doc_ids, scores)
+            self.max_scores[term] = max(scores)
+
+    def _query_terms(self, query):
+        counts = Counter(token for token in tokenize(query, self.stop_words) if token in self.postings)
+        return counts.items()
+
+    # Function to score every document; returns one score per indexed document
+    def score_all(self, query):
+        scores = [0.0] * self.doc_count
+        for term, query_tf in self._query_terms(query):
+            doc_ids, term_scores = self.postings[term]
+            for doc_id, score in zip(doc_ids, term_scores):
+                scores[doc_id] += query_tf * score
+        return scores
+
+    # Function to return the top-k (doc id, score) pairs using MaxScore
+    def search(self, query, k=10):
+        # Posting lists ordered by ascending upper bound
+        lists = sorted(
+            (
+                (query_tf * self.max_scores[term], query_tf, *self.postings[term])
+                for term, query_tf in self._query_terms(query)
+            ),
+            key=lambda item: item[0],
+        )
+        if not lists or k <= 0:
+            return []
+        # bounds[i] is the best score reachable from lists[0..i] alone
+        bounds = []
+        total = 0.0
+        for upper_bound, *_ in lists:
+            total += upper_bound
+            bounds.append(total)
+
+        pointers = [0] * len(lists)
+        top = []  # min-heap of (score, doc id)
+        threshold = 0.0
+        first_essential = 0
+        while first_essential < len(lists):
+            # Next candidate is the smallest current doc id among essential lists
+            candidate = None
+            for i in range(first_essential, len(lists)):
+                doc_ids = lists[i][2]
+                if pointers[i] < len(doc_ids) and (candidate is None or doc_ids[pointers[i]] < candidate):
+                    candidate = doc_ids[pointers[i]]
+            if candidate is None:
+                break
+
+            score = 0.0
+            for i in range(first_essential, len(lists)):
+                _, query_tf, doc_ids, scores = lists[i]
+                if pointers[i] < len(doc_ids) and doc_ids[pointers[i]] == candidate:
+                    score += query_tf * scores[pointers[i]]
+                    pointers[i] += 1
+
+            # Non-essential lists are only probed while the candidate can still qualify
+            for i in range(first_essential - 1, -1, -1):
+                if score + bounds[i] <= threshold:
+                    break
+                _, query_tf, doc_ids, scores = lists[i]
+                pointers[i] = bisect_left(doc_ids, candidate, pointers[i])
+                if pointers[i] < len(doc_ids) and doc_ids[pointers[i]] == candidate:
+                    score += query_tf * scores[pointers[i]]
+
+            if len(top) < k:
+                heapq.heappush(top, (score, -candidate))
+            elif score > threshold:
+                heapq.heapreplace(top, (score, -candidate))
+            if len(top) == k:
+                threshold = top[0][0]
+                while first_essential < len(lists) and bounds[first_essential] <= threshold:
+                    first_essential += 1
+
+        return [(-neg_doc_id, score) for score, neg_doc_id in sorted(top, reverse=True)]
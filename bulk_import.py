@@ -0,0 +1,143 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from form_validation import PROJECT_SCHEMA, RESUME_BUILDER_SCHEMA, ColumnValidator, add_errors
+from locations import get_locations
+from project_dates import parse_dates
+
+# Records read, validated and written at a time
+DEFAULT_CHUNK_ROWS = 200_000
+
+SCHEMAS = {
+    "resume": RESUME_BUILDER_SCHEMA,
+    "project": PROJECT_SCHEMA,
+}
+
+
+# Function to stream records from a CSV or JSONL file as DataFrames of strings
+def read_records(input_path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    if input_path.endswith((".jsonl", ".ndjson")):
+        for chunk in pd.read_json(input_path, lines=True, chunksize=chunk_rows, dtype=False):
+            yield chunk.astype(object).where(chunk.notna(), "").astype(str)
+        return
+    # Everything as text, so IDs and phone numbers keep their leading zeros and "NA" stays a value
+    yield from pd.read_csv(input_path, dtype=str, keep_default_na=False, chunksize=chunk_rows)
+
+
+class LocationCheck:
+    """Vectorised check that each record's country, state and city exist together in the location index."""
+
+    def __init__(self, index):
+        state_countries = np.repeat(index.countries_array, np.diff(index.country_offsets))
+        self.known = pd.MultiIndex.from_arrays([
+            np.repeat(state_countries, np.diff(index.state_offsets)).astype(str),
+            np.repeat(index.states_array, np.diff(index.state_offsets)).astype(str),
+            np.asarray(index.cities_array).astype(str),
+        ])
+
+    def __call__(self, frame, errors):
+        columns = [frame[name].astype(str).str.strip() for name in ("country", "state", "city")]
+        # Missing parts are already reported by the required rules
+        present = np.logical_and.reduce([(column != "").to_numpy() for column in columns])
+        found = pd.MultiIndex.from_arrays(columns).isin(self.known)
+        add_errors(errors, present & ~found, "Unknown location: the country, state and city do not match.")
+
+
+class RecordWriter:
+    """Append DataFrame chunks to a Parquet (zstd) or CSV file, chosen by extension."""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        self.writer = None
+        self.handle = None
+
+    def write(self, frame):
+        if self.parquet:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, table.schema, compression="zstd")
+            self.writer.write_table(table.cast(self.writer.schema))
+        else:
+            if self.handle is None:
+                self.handle = open(self.path, "w", newline="", encoding="utf-8")
+                frame.iloc[:0].to_csv(self.handle, index=False)
+            frame.to_csv(self.handle, index=False, header=False)
+
+    def close(self, columns):
+        # An input with no rows of this kind still gets a file with the header
+        if self.writer is None and self.handle is None:
+            self.write(pd.DataFrame({column: pd.Series(dtype=str) for column in columns}))
+        if self.writer is not None:
+            self.writer.close()
+        if self.handle is not None:
+            self.handle.close()
+
+
+# Function to add integer <field>_month and <field>_day columns for each date field, parsed in bulk.
+# Empty dates (e.g. an end date still in progress) get -1 in both; MM/YYYY dates get project_dates.NO_DAY days.
+def with_parsed_dates(frame, schema):
+    frame = frame.copy()
+    for name, spec in schema.items():
+        if spec.get("date"):
+            months, days, valid = parse_dates(frame[name])
+            frame[f"{name}_month"] = np.where(valid, months, -1).astype(np.int32)
+            frame[f"{name}_day"] = np.where(valid, days, -1).astype(np.int32)
+    return frame
+
+
+# Function to validate every record of a CSV/JSONL file, writing the valid ones and a reject report.
+# The report keeps the input row number (1-based, header excluded), the fields and all error messages.
+def import_records(input_path, valid_path, reject_path, schema=RESUME_BUILDER_SCHEMA, chunk_rows=DEFAULT_CHUNK_ROWS):
+    started = time.perf_counter()
+    record_checks = [LocationCheck(get_locations())] if {"country", "state", "city"} <= set(schema) else []
+    validator = ColumnValidator(schema, record_checks)
+    valid_writer, reject_writer = RecordWriter(valid_path), RecordWriter(reject_path)
+    rows = valid = 0
+    try:
+        for chunk in read_records(input_path, chunk_rows):
+            for name in validator.fields:
+                if name not in chunk:
+                    chunk[name] = ""
+            chunk = chunk[validator.fields]
+            errors = validator.validate(chunk)
+            ok = errors == ""
+            valid_writer.write(with_parsed_dates(chunk[ok], schema))
+            if not ok.all():
+                rejects = chunk[~ok].copy()
+                rejects.insert(0, "row", np.flatnonzero(~ok) + rows + 1)
+                rejects["errors"] = errors[~ok]
+                reject_writer.write(rejects)
+            rows += len(chunk)
+            valid += int(ok.sum())
+    finally:
+        valid_writer.close(list(with_parsed_dates(pd.DataFrame(columns=validator.fields), schema)))
+        reject_writer.close(["row", *validator.fields, "errors"])
+    return {"rows": rows, "valid": valid, "rejected": rows - valid, "seconds": time.perf_counter() - started}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and import resume records in bulk from CSV or JSONL.")
+    parser.add_argument("input", help="CSV (with a header row) or JSONL file of records")
+    parser.add_argument("--schema", choices=list(SCHEMAS), default="resume")
+    parser.add_argument("--valid", help="Output for valid records (.parquet or .csv); defaults next to the input")
+    parser.add_argument("--rejects", help="CSV reject report; defaults next to the input")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    stem = os.path.splitext(args.input)[0]
+    valid_path = args.valid or f"{stem}.valid.parquet"
+    reject_path = args.rejects or f"{stem}.rejects.csv"
+    result = import_records(args.input, valid_path, reject_path, SCHEMAS[args.schema], args.chunk_rows)
+    print(f"{result['rows']} records in {result['seconds']:.1f}s: "
+          f"{result['valid']} valid -> {valid_path}, {result['rejected']} rejected -> {reject_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+
+from sampling_stats import ReservoirSample
+from streaming_stats import NumericSummary
+
+# Points outside [Q1 - k * IQR, Q3 + k * IQR] are flagged as IQR outliers
+IQR_FENCE = 1.5
+
+# Points with a robust z-score (0.6745 * (x - median) / MAD) beyond this are flagged
+ROBUST_Z_THRESHOLD = 3.5
+MAD_SCALE = 0.6745
+
+# Rows sampled for the Spearman correlation
+SPEARMAN_SAMPLE_ROWS = 100_000
+
+
+class CorrelationAccumulator:
+    """Running means and co-moments of a set of columns, mergeable chunk by chunk.
+
+    Rows with a missing value in any of the columns are skipped.
+    """
+
+    def __init__(self, width):
+        self.count = 0
+        self.mean = np.zeros(width)
+        self.comoment = np.zeros((width, width))
+
+    def update(self, matrix):
+        matrix = matrix[~np.isnan(matrix).any(axis=1)]
+        count = matrix.shape[0]
+        if not count:
+            return
+        mean = matrix.mean(axis=0)
+        centered = matrix - mean
+        comoment = centered.T @ centered
+        # Chan's parallel update, applied to the whole co-moment matrix at once
+        total = self.count + count
+        delta = mean - self.mean
+        self.comoment += comoment + np.outer(delta, delta) * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+
+    def correlation(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scale = np.sqrt(np.diag(self.comoment))
+            return self.comoment / np.outer(scale, scale)
+
+
+class CorrelationOutlierAnalyzer:
+    """Pearson/Spearman correlation and IQR/robust z-score outliers for numeric columns.
+
+    ``fit`` makes one chunked pass, gathering each column's running statistics
+    and quantile sketch, the Pearson co-moments and a uniform sample of rows.
+    Everything else is derived from those: the fences and the MAD (around the
+    current median) from the sketches, Spearman from the sampled rows mapped
+    to mid-ranks through the sketched CDFs, and the outlier counts from the
+    sketched tails. All of it is exact while the sketches hold every value
+    and the sample holds every row.
+
+    ``append`` folds new rows into the same state, so every result follows
+    the data. ``recount`` makes one more pass to count outliers exactly
+    against the current fences; rows appended after that are counted against
+    the fences of their time, and ``outliers`` reports how many were counted
+    against older fences until the next ``recount``.
+    """
+
+    def __init__(self, columns, sample_size=SPEARMAN_SAMPLE_ROWS, seed=None):
+        self.columns = list(columns)
+        self.summaries = {column: NumericSummary() for column in self.columns}
+        self.pearson_accumulator = CorrelationAccumulator(len(self.columns))
+        self.sample = ReservoirSample(sample_size, seed)
+        self.exact_counts = False
+        self.iqr_outliers = dict.fromkeys(self.columns, 0)
+        self.robust_outliers = dict.fromkeys(self.columns, 0)
+        self.counted = dict.fromkeys(self.columns, 0)
+        self.stale = dict.fromkeys(self.columns, 0)  # Rows counted against older fences
+        self.fences = {}
+        self.mads = {}
+
+    def _matrix(self, chunk):
+        return np.column_stack([
+            pd.to_numeric(chunk[column], errors="coerce").to_numpy(dtype=np.float64) for column in self.columns
+        ])
+
+    def _update(self, chunk):
+        matrix = self._matrix(chunk)
+        for i, column in enumerate(self.columns):
+            self.summaries[column].update(pd.Series(matrix[:, i]))
+        self.pearson_accumulator.update(matrix)
+        self.sample.update(pd.DataFrame(matrix, columns=range(len(self.columns))))
+
+    def _refresh_fences(self):
+        for column, summary in self.summaries.items():
+            q1, median, q3 = summary.sketch.quantiles((0.25, 0.5, 0.75))
+            spread = q3 - q1
+            self.fences[column] = (median, q1 - IQR_FENCE * spread, q3 + IQR_FENCE * spread)
+            self.mads[column] = summary.sketch.deviation_quantiles(median, [0.5])[0]
+
+    # Function to return |x - median| beyond which a value's robust z-score passes the threshold
+    def _robust_cutoff(self, column):
+        return ROBUST_Z_THRESHOLD * self.mads[column] / MAD_SCALE
+
+    def _count(self, chunk):
+        matrix = self._matrix(chunk)
+        for i, column in enumerate(self.columns):
+            median, lower, upper = self.fences[column]
+            values = matrix[:, i]
+            values = values[~np.isnan(values)]
+            self.iqr_outliers[column] += int(((values < lower) | (values > upper)).sum())
+            if self.mads[column] > 0:
+                self.robust_outliers[column] += int((np.abs(values - median) > self._robust_cutoff(column)).sum())
+            self.counted[column] += values.size
+
+    # Function to estimate from a column's sketch how many values lie strictly outside [lower, upper]
+    def _tail_count(self, column, lower, upper):
+        summary = self.summaries[column]
+        below, above = summary.sketch.cdf([lower], strict=True)[0], summary.sketch.cdf([upper])[0]
+        return int(round(summary.count * (below + 1 - above)))
+
+    # Function to analyse a file in one pass; make_chunks returns a fresh chunk iterator on each call
+    def fit(self, make_chunks, exact_counts=False):
+        for chunk in make_chunks():
+            self._update(chunk)
+        self._refresh_fences()
+        return self.recount(make_chunks) if exact_counts else self
+
+    # Function to count the outliers of all rows exactly against the current fences and MAD, in one more pass
+    def recount(self, make_chunks):
+        for counts in (self.iqr_outliers, self.robust_outliers, self.counted, self.stale):
+            counts.update(dict.fromkeys(self.columns, 0))
+        for chunk in make_chunks():
+            self._count(chunk)
+        self.exact_counts = True
+        return self
+
+    # Function to fold newly appended rows into all statistics
+    def append(self, chunk):
+        self._update(chunk)
+        self._refresh_fences()
+        if self.exact_counts:
+            # Everything counted so far was counted against the fences before this refresh
+            self.stale = dict(self.counted)
+            self._count(chunk)
+
+    def pearson(self):
+        return pd.DataFrame(self.pearson_accumulator.correlation(), index=self.columns, columns=self.columns)
+
+    # Spearman is the Pearson correlation of ranks. Each sampled value is ranked by the mid-rank of its
+    # whole column, the average of the sketched CDF just below and at the value, so ties share one rank.
+    def spearman(self):
+        accumulator = CorrelationAccumulator(len(self.columns))
+        if self.sample.rows is not None:
+            sample = self.sample.rows.to_numpy(dtype=np.float64)
+            sketches = [self.summaries[column].sketch for column in self.columns]
+            accumulator.update(np.column_stack([
+                (sketch.cdf(sample[:, i], strict=True) + sketch.cdf(sample[:, i])) / 2
+                for i, sketch in enumerate(sketches)
+            ]))
+        return pd.DataFrame(accumulator.correlation(), index=self.columns, columns=self.columns)
+
+    def outliers(self):
+        rows = []
+        for column in self.columns:
+            median, lower, upper = self.fences[column]
+            if self.exact_counts:
+                iqr_outliers, robust_outliers = self.iqr_outliers[column], self.robust_outliers[column]
+            else:
+                cutoff = self._robust_cutoff(column)
+                iqr_outliers = self._tail_count(column, lower, upper)
+                robust_outliers = self._tail_count(column, median - cutoff, median + cutoff) if cutoff > 0 else 0
+            rows.append({
+                "column": column,
+                "median": median,
+                "MAD": self.mads[column],
+                "IQR lower fence": lower,
+                "IQR upper fence": upper,
+                "IQR outliers": iqr_outliers,
+                "robust z outliers": robust_outliers,
+                "counts": "exact" if self.exact_counts else "estimated",
+                "rows counted with older fences": self.stale[column],
+            })
+        return pd.DataFrame(rows).set_index("column")
+
+    # Function to flag the outlying values of a chunk, e.g. for a preview
+    def flag(self, chunk):
+        flags = pd.DataFrame(index=chunk.index)
+        for column in self.columns:
+            median, lower, upper = self.fences[column]
+            mad = self.mads[column]
+            values = pd.to_numeric(chunk[column], errors="coerce")
+            robust_z = MAD_SCALE * (values - median) / mad if mad > 0 else values * 0
+            flags[f"{column} IQR outlier"] = (values < lower) | (values > upper)
+            flags[f"{column} robust z outlier"] = robust_z.abs() > ROBUST_Z_THRESHOLD
+        return flags
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import threading
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.ipc as ipc
+
+from csv_schema import CACHE_DIR, evict_files, file_fingerprint, get_schema, touch
+
+CONVERTED_CACHE_DIR = os.path.join(CACHE_DIR, "converted")
+
+# Converted files are evicted, least recently used first, above this total size
+MAX_CACHE_BYTES = 2 * 1024 ** 3
+
+# Bytes of CSV parsed per record batch while converting
+CONVERT_BLOCK_BYTES = 16 * 1024 * 1024
+
+# One lock per conversion in progress, so concurrent requests for the same source convert it once
+_target_locks = {}
+_target_locks_guard = threading.Lock()
+
+ARROW_TYPES = {
+    "int64": pa.int64(),
+    "float32": pa.float32(),
+    "bool": pa.bool_(),
+    "category": pa.string(),
+    "object": pa.string(),
+}
+
+
+# Function to name the converted copy of a source file; the path part groups all versions of one source
+def cached_file_path(file_path, cache_dir=CONVERTED_CACHE_DIR):
+    path_key = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{path_key}-{file_fingerprint(file_path)}.arrow")
+
+
+# Function to stream a CSV into an uncompressed Arrow IPC file that can be memory-mapped
+def convert_csv(file_path, target_path, schema):
+    reader = pacsv.open_csv(
+        file_path,
+        read_options=pacsv.ReadOptions(
+            column_names=schema["columns"],
+            skip_rows=1 if schema["header"] else 0,
+            block_size=CONVERT_BLOCK_BYTES,
+        ),
+        convert_options=pacsv.ConvertOptions(
+            column_types={column: ARROW_TYPES[dtype] for column, dtype in schema["dtypes"].items()},
+        ),
+    )
+    # Unique per process and thread, so concurrent writers never share a temp file
+    temp_path = f"{target_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with ipc.new_file(temp_path, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+        os.replace(temp_path, target_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+# Function to delete least recently used converted files until the cache fits its size limit
+def evict(cache_dir=CONVERTED_CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    evict_files(cache_dir, ".arrow", max_bytes)
+
+
+# Function to return the lock guarding the conversion of one target file
+def _target_lock(target_path):
+    with _target_locks_guard:
+        return _target_locks.setdefault(target_path, threading.Lock())
+
+
+# Function to name the marker recording that one version of a source failed to convert
+def failed_marker_path(target_path):
+    return os.path.splitext(target_path)[0] + ".failed"
+
+
+# Function to return the converted copy of a CSV, converting it on first use.
+# Returns None when the file cannot be converted with its inferred schema; the failure is
+# recorded for that version of the file (its path, size and mtime), so it is only tried once.
+def ensure_converted(file_path, cache_dir=CONVERTED_CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    target_path = cached_file_path(file_path, cache_dir)
+    failed_path = failed_marker_path(target_path)
+    if touch(target_path):
+        return target_path
+    if os.path.exists(failed_path):
+        return None
+    lock = _target_lock(target_path)
+    try:
+        with lock:
+            # Another request may have converted it, or failed to, while this one waited
+            if touch(target_path):
+                return target_path
+            if os.path.exists(failed_path):
+                return None
+            os.makedirs(cache_dir, exist_ok=True)
+            # Older versions of the same source are stale once its size or mtime changes;
+            # temp files belong to conversions still in progress and are left alone
+            path_prefix = os.path.basename(target_path).split("-")[0]
+            for name in os.listdir(cache_dir):
+                if name.startswith(path_prefix + "-") and not name.endswith(".tmp"):
+                    try:
+                        os.remove(os.path.join(cache_dir, name))
+                    except FileNotFoundError:
+                        pass
+            try:
+                convert_csv(file_path, target_path, get_schema(file_path))
+            except pa.ArrowInvalid:
+                open(failed_path, "w").close()
+                return None
+    finally:
+        # Requests arriving later find the converted file or the marker, so the lock is no longer needed
+        with _target_locks_guard:
+            if _target_locks.get(target_path) is lock:
+                del _target_locks[target_path]
+    evict(cache_dir, max_bytes)
+    return target_path
+
+
+# Function to yield DataFrame chunks of a converted file straight from the memory map.
+# Record batches longer than chunk_size rows are sliced (without copying) before conversion.
+def iter_cached_chunks(cached_path, schema, chunk_size=None):
+    categories = [column for column, dtype in schema["dtypes"].items() if dtype == "category"]
+    with pa.memory_map(cached_path) as source:
+        reader = ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            step = chunk_size or batch.num_rows or 1
+            for start in range(0, batch.num_rows, step):
+                chunk = batch.slice(start, step).to_pandas()
+                for column in categories:
+                    chunk[column] = chunk[column].astype("category")
+                yield chunk
+
+
+# Function to load a whole converted file as a memory-mapped Arrow table
+def open_cached(cached_path):
+    # The map stays open for as long as the table's buffers reference it
+    return ipc.open_file(pa.memory_map(cached_path)).read_all()
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+
+# Cache directory shared by the analyzer's caches, next to this script
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".analyzer_cache")
+SCHEMA_CACHE_DIR = os.path.join(CACHE_DIR, "schemas")
+
+# Cached schemas are evicted, least recently used first, above this total size
+MAX_SCHEMA_CACHE_BYTES = 16 * 1024 ** 2
+
+# Rows sampled once to infer the schema of a file
+SAMPLE_ROWS = 10_000
+
+# Text columns with at most this many distinct values (and mostly repeats) become categoricals
+MAX_CATEGORIES = 1000
+
+
+# Function to identify a file by its path, size and modification time
+def file_fingerprint(file_path):
+    stat = os.stat(file_path)
+    key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+# Function to decide whether the first row of a CSV is a header: every column that is
+# numeric below the first row votes "header" if its first value is not a number
+def has_header(file_path, sample_rows=100):
+    sample = pd.read_csv(file_path, header=None, nrows=sample_rows, dtype=str)
+    votes = 0
+    for column in sample.columns:
+        body = sample[column].iloc[1:].dropna()
+        if len(body) and pd.to_numeric(body, errors="coerce").notna().all():
+            first = pd.to_numeric(sample[column].iloc[:1], errors="coerce").iloc[0]
+            votes += -1 if pd.notna(first) else 1
+    # Text-only files have no evidence either way; assume a header like pandas does
+    return votes >= 0
+
+
+# Function to choose a compact dtype for a sampled column
+def compact_dtype(column):
+    if pd.api.types.is_bool_dtype(column):
+        return "bool"
+    if pd.api.types.is_integer_dtype(column):
+        return "int64"
+    if pd.api.types.is_float_dtype(column):
+        return "float32"
+    distinct = column.nunique(dropna=True)
+    if distinct <= MAX_CATEGORIES and distinct <= len(column) // 2:
+        return "category"
+    return "object"
+
+
+# Function to sample a CSV once and infer its header, column names and compact dtypes
+def infer_schema(file_path, sample_rows=SAMPLE_ROWS):
+    header = has_header(file_path)
+    sample = pd.read_csv(file_path, nrows=sample_rows, header=0 if header else None)
+    columns = [str(column) if header else f"column_{column}" for column in sample.columns]
+    sample.columns = columns
+    return {
+        "header": header,
+        "columns": columns,
+        "dtypes": {column: compact_dtype(sample[column]) for column in columns},
+    }
+
+
+# Function to mark a cache file as recently used; False when it does not exist (any more)
+def touch(path):
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+# Function to delete the least recently used files with the given suffix until a cache
+# directory fits its size limit. Files removed meanwhile by another request are skipped.
+def evict_files(cache_dir, suffix, max_bytes):
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(suffix):
+            path = os.path.join(cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # Already evicted by another request
+        total -= size
+
+
+# Function to return the cached schema of a file, inferring and caching it on first use
+def get_schema(file_path, cache_dir=SCHEMA_CACHE_DIR, max_bytes=MAX_SCHEMA_CACHE_BYTES):
+    cache_path = os.path.join(cache_dir, f"{file_fingerprint(file_path)}.json")
+    try:
+        with open(cache_path, encoding="utf-8") as handle:
+            schema = json.load(handle)
+    except FileNotFoundError:
+        pass  # Not cached yet, or evicted
+    else:
+        touch(cache_path)
+        return schema
+    schema = infer_schema(file_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Written to a temp file unique to this thread and renamed, so concurrent readers never see half a file
+    temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(schema, handle)
+    os.replace(temp_path, cache_path)
+    evict_files(cache_dir, ".json", max_bytes)
+    return schema
+
+
+# Function to turn a schema into pd.read_csv keyword arguments
+def read_options(schema, typed=True):
+    options = {"header": 0 if schema["header"] else None, "names": schema["columns"]}
+    if typed:
+        options["dtype"] = schema["dtypes"]
+    return options
+
+
+# Function to load a CSV with its cached schema; falls back to untyped parsing if
+# rows beyond the sample do not fit the inferred dtypes
+def load_csv(file_path, **kwargs):
+    schema = get_schema(file_path)
+    try:
+        return pd.read_csv(file_path, **read_options(schema), **kwargs)
+    except (ValueError, OverflowError):
+        return pd.read_csv(file_path, **read_options(schema, typed=False), **kwargs)
+
+
+# Function to stream a CSV in chunks with its cached schema. If a chunk beyond the sample does not
+# fit the inferred dtypes (e.g. a blank in an int column), the rest of the file is parsed untyped;
+# chunks already yielded are not yielded again.
+def iter_csv(file_path, chunk_size, schema=None, **kwargs):
+    schema = schema or get_schema(file_path)
+    yielded = 0
+    try:
+        for chunk in pd.read_csv(file_path, chunksize=chunk_size, **read_options(schema), **kwargs):
+            yield chunk
+            yielded += 1
+        return
+    except (ValueError, OverflowError):
+        pass
+    chunks = pd.read_csv(file_path, chunksize=chunk_size, **read_options(schema, typed=False), **kwargs)
+    for number, chunk in enumerate(chunks):
+        if number >= yielded:
+            yield chunk
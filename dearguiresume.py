@@ -1,20 +1,21 @@
+import logging
+
 from dearpygui.dearpygui import *
 
-# Sample location data for countries, states, and cities
-location_data = {
-    "India": {
-        "TamilNadu": ["Chennai", "Coimbatore", "Madurai"],
-        "Karnataka": ["Bangalore", "Mysore", "Hubli"],
-    },
-    "USA": {
-        "California": ["Los Angeles", "San Francisco", "San Diego"],
-        "Texas": ["Houston", "Austin", "Dallas"],
-    },
-}
+from form_logging import get_logger, log_event
+from form_validation import resume_builder_validator
+from location_search import get_location_search
+from locations import get_locations
+
+locations = get_locations()
+location_search = get_location_search()
+logger = get_logger("dearpygui_form")
 
 def update_states(sender, app_data, user_data):
     country = get_value("Country")
-    configure_item("State", items=["Select State"] + list(location_data.get(country, {}).keys()))
+    states = locations.states(country)
+    configure_item("State", items=["Select State"] + states)
+    log_event(logger, logging.DEBUG, "states_updated", country=country, count=len(states))
     set_value("State", "Select State")
     configure_item("City", items=["Select City"])
     set_value("City", "Select City")
@@ -22,9 +23,27 @@ def update_states(sender, app_data, user_data):
 def update_cities(sender, app_data, user_data):
     country = get_value("Country")
     state = get_value("State")
-    configure_item("City", items=["Select City"] + location_data.get(country, {}).get(state, []))
+    cities = locations.cities(country, state)
+    configure_item("City", items=["Select City"] + cities)
+    log_event(logger, logging.DEBUG, "cities_updated", country=country, state=state, count=len(cities))
     set_value("City", "Select City")
 
+def search_locations(sender, app_data, user_data):
+    configure_item("Matches", items=location_search.labels(get_value("Find Location")))
+
+def pick_location(sender, app_data, user_data):
+    items = get_item_configuration("Matches")["items"]
+    index = get_value("Matches")
+    match = location_search.resolve(items[index]) if 0 <= index < len(items) else None
+    if match is None:
+        return
+    set_value("Country", match["country"])
+    update_states(sender, app_data, user_data)
+    set_value("State", match["state"])
+    update_cities(sender, app_data, user_data)
+    if match["city"]:
+        set_value("City", match["city"])
+
 def submit_form(sender, app_data, user_data):
     first_name = get_value("First Name")
     last_name = get_value("Last Name")
@@ -35,14 +54,13 @@ def submit_form(sender, app_data, user_data):
     state = get_value("State")
     city = get_value("City")
 
-    # Validate required fields
-    if not first_name or not last_name or not employee_id or not mobile_number or country == "Select Country" or state == "Select State" or city == "Select City":
-        log_error("All fields are required!")
-        return
-
-    # Validate mobile number
-    if not mobile_number.isdigit() or len(mobile_number) != 10:
-        log_error("Invalid mobile number! Must be 10 digits.")
+    errors = resume_builder_validator.validate({
+        "first_name": first_name, "last_name": last_name, "employee_id": employee_id,
+        "mobile_number": mobile_number, "country": country, "state": state, "city": city,
+    })
+    if errors:
+        for error in errors:
+            log_error(error)
         return
 
     # Log the resume details
@@ -55,7 +73,9 @@ with window("Resume Builder"):
     add_combo("Suffix", label="Suffix", items=["Select", "Mr", "Ms", "Mrs"])
     add_input_text("Employee ID", label="Employee ID")
     add_input_text("Mobile Number", label="Mobile Number")
-    add_combo("Country", label="Country", items=["Select Country"] + list(location_data.keys()), callback=update_states)
+    add_input_text("Find Location", label="Find Location", hint="Type a city or state", callback=search_locations)
+    add_listbox("Matches", label="Matches", items=[], num_items=5, callback=pick_location)
+    add_combo("Country", label="Country", items=["Select Country"] + locations.countries(), callback=update_states)
     add_combo("State", label="State", items=["Select State"], callback=update_cities)
     add_combo("City", label="City", items=["Select City"])
     add_button("Submit", callback=submit_form)
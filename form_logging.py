@@ -0,0 +1,80 @@
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+
+# Parent logger of every form module
+ROOT_LOGGER = "resume_forms"
+
+# Level for the form loggers, e.g. RESUME_FORMS_LOG_LEVEL=DEBUG
+LOG_LEVEL = os.environ.get("RESUME_FORMS_LOG_LEVEL", "WARNING").upper()
+
+# Only every n-th DEBUG/INFO record of each event is written; warnings and errors always are
+SAMPLE_EVERY = max(int(os.environ.get("RESUME_FORMS_LOG_SAMPLE_EVERY", "10")), 1)
+
+
+class SamplingFilter(logging.Filter):
+    """Pass one in ``every`` records per logger and event at or below ``max_level``."""
+
+    def __init__(self, every=SAMPLE_EVERY, max_level=logging.INFO):
+        super().__init__()
+        self.every = every
+        self.max_level = max_level
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > self.max_level or self.every == 1:
+            return True
+        key = (record.name, record.msg)
+        with self.lock:
+            counter = self.counters.setdefault(key, itertools.count())
+            return next(counter) % self.every == 0
+
+
+class StructuredFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, event and the record's fields.
+
+    Field values that are callables are only called here, after the level
+    check and sampling, so expensive diagnostics are never computed for
+    records that are dropped.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        for name, value in getattr(record, "fields", {}).items():
+            entry[name] = value() if callable(value) else value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def _configure_root():
+    root = logging.getLogger(ROOT_LOGGER)
+    if not root.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(StructuredFormatter())
+        handler.addFilter(SamplingFilter())
+        root.addHandler(handler)
+        root.setLevel(LOG_LEVEL)
+        root.propagate = False
+    return root
+
+
+# Function to return the logger of a form module, configuring the shared handler on first use
+def get_logger(name):
+    _configure_root()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+# Function to log an event with structured fields; nothing is built when the level is disabled
+def log_event(logger, level, event, exc_info=False, **fields):
+    if logger.isEnabledFor(level):
+        logger.log(level, event, exc_info=exc_info, extra={"fields": fields})
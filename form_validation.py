@@ -0,0 +1,242 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from project_dates import NO_DAY, parse_date, parse_dates
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+# Field rules: each field maps to a spec with any of
+#   label        name shown in messages (defaults to the field name)
+#   required     the value must be present; placeholder texts count as missing
+#   placeholders dropdown texts such as "Select Country" that mean "nothing chosen"
+#   min_length / max_length
+#   pattern      regular expression the whole value must match
+#   date         the value must be a real MM/DD/YYYY or MM/YYYY date (02/31/2024 is not)
+#   not_before   name of a date field this date must not precede, when both are given
+#   suffixes     allowed file name endings, case-insensitive
+#   message      replaces the default message of the pattern, date or suffixes rule
+#   unique       the value must not repeat across records (checked by bulk imports only)
+
+# Fields of the PyQt, Kivy and DearPyGui resume builders
+RESUME_BUILDER_SCHEMA = {
+    "first_name": {"label": "First Name", "required": True},
+    "last_name": {"label": "Last Name", "required": True},
+    "employee_id": {"label": "Employee ID", "required": True, "unique": True},
+    "mobile_number": {
+        "label": "Mobile Number",
+        "required": True,
+        "pattern": r"\d{10}",
+        "message": "Invalid mobile number! Must be 10 digits.",
+    },
+    "country": {"label": "Country", "required": True, "placeholders": ("Select Country",)},
+    "state": {"label": "State", "required": True, "placeholders": ("Select State",)},
+    "city": {"label": "City", "required": True, "placeholders": ("Select City",)},
+}
+
+# Fields of the Gradio professional details form
+PROFESSIONAL_DETAILS_SCHEMA = {
+    "name": {"label": "Name", "required": True},
+    "email": {"label": "Email", "required": True},
+    "mobile": {"label": "Mobile Number", "required": True},
+    "country": {"label": "Country", "required": True},
+    "state": {"label": "State", "required": True},
+    "city": {"label": "City", "required": True},
+    "photo": {
+        "label": "Photo",
+        "suffixes": IMAGE_SUFFIXES,
+        "message": "Please upload a valid image file (PNG, JPG, JPEG).",
+    },
+}
+
+# Fields of one project entry in the Gradio form
+PROJECT_SCHEMA = {
+    "project_name": {"label": "Project Name", "required": True},
+    "project_description": {"label": "Description", "required": True},
+    "tools_used": {"label": "Tools Used", "required": True},
+    "roles": {"label": "Roles", "required": True},
+    "start_date": {"label": "Start Date", "date": True, "message": "Invalid Start Date format. Use MM/DD/YYYY or MM/YYYY."},
+    "end_date": {
+        "label": "End Date",
+        "date": True,
+        "message": "Invalid End Date format. Use MM/DD/YYYY or MM/YYYY.",
+        "not_before": "start_date",
+    },
+}
+
+
+# Function to turn one field spec into a checker returning that field's error messages
+def compile_field(name, spec):
+    label = spec.get("label", name)
+    placeholders = frozenset(spec.get("placeholders", ()))
+    required = spec.get("required", False)
+    checks = []
+    if "min_length" in spec:
+        checks.append(lambda value, n=spec["min_length"]: len(value) < n and f"{label} must be at least {n} characters.")
+    if "max_length" in spec:
+        checks.append(lambda value, n=spec["max_length"]: len(value) > n and f"{label} must be at most {n} characters.")
+    if "pattern" in spec:
+        pattern = re.compile(spec["pattern"])
+        message = spec.get("message", f"{label} has an invalid format.")
+        checks.append(lambda value, message=message: not pattern.fullmatch(value) and message)
+    if spec.get("date"):
+        message = spec.get("message", f"{label} must be MM/DD/YYYY or MM/YYYY.")
+        checks.append(lambda value, message=message: not is_date(value) and message)
+    if "suffixes" in spec:
+        suffixes = tuple(suffix.lower() for suffix in spec["suffixes"])
+        message = spec.get("message", f"{label} must end with one of: {', '.join(suffixes)}.")
+        checks.append(lambda value, message=message: not value.lower().endswith(suffixes) and message)
+
+    def check(value):
+        value = "" if value is None else str(value).strip()
+        if not value or value in placeholders:
+            return [f"{label} is required."] if required else []
+        return [error for error in (rule(value) for rule in checks) if error]
+
+    return check
+
+
+def is_date(value):
+    try:
+        parse_date(value)
+    except ValueError:
+        return False
+    return True
+
+
+# Function to compare two parsed dates by day when both have one, by month otherwise
+def is_before(date, other):
+    if date[1] is not None and other[1] is not None:
+        return date[1] < other[1]
+    return date[0] < other[0]
+
+
+# Function to turn a not_before rule into a checker over a whole record
+def compile_order(name, spec, schema):
+    other = spec["not_before"]
+    message = f"{spec.get('label', name)} must not be before {schema[other].get('label', other)}."
+
+    def check(record):
+        try:
+            date, earliest = parse_date(record.get(name) or ""), parse_date(record.get(other) or "")
+        except ValueError:
+            return []  # Missing or invalid dates are reported by the field rules
+        return [message] if is_before(date, earliest) else []
+
+    return check
+
+
+class Validator:
+    """Validator compiled once from a field schema.
+
+    ``validate`` checks every field of a record in one pass and returns all
+    error messages, in schema order; an empty list means the record is valid.
+    """
+
+    def __init__(self, schema):
+        self.checkers = [(name, compile_field(name, spec)) for name, spec in schema.items()]
+        self.order_checks = [compile_order(name, spec, schema) for name, spec in schema.items() if "not_before" in spec]
+
+    def validate(self, record):
+        errors = []
+        for name, check in self.checkers:
+            errors.extend(check(record.get(name)))
+        for check in self.order_checks:
+            errors.extend(check(record))
+        return errors
+
+
+# Function to append a message to the errors of the rows selected by a boolean mask
+def add_errors(errors, mask, message):
+    mask = np.asarray(mask, dtype=bool)
+    if mask.any():
+        errors[mask] += message + "; "
+
+
+# Function to turn one field spec into a checker over a whole column of stripped strings.
+# The checker adds its messages to an object array of per-row errors.
+def compile_column(name, spec):
+    label = spec.get("label", name)
+    placeholders = list(spec.get("placeholders", ()))
+    required = spec.get("required", False)
+    seen = set() if spec.get("unique") else None
+
+    def check(values, errors):
+        missing = (values == "") | values.isin(placeholders)
+        if required:
+            add_errors(errors, missing, f"{label} is required.")
+        present = ~missing
+        if "min_length" in spec:
+            n = spec["min_length"]
+            add_errors(errors, present & (values.str.len() < n), f"{label} must be at least {n} characters.")
+        if "max_length" in spec:
+            n = spec["max_length"]
+            add_errors(errors, present & (values.str.len() > n), f"{label} must be at most {n} characters.")
+        if "pattern" in spec:
+            add_errors(errors, present & ~values.str.fullmatch(spec["pattern"]),
+                       spec.get("message", f"{label} has an invalid format."))
+        if spec.get("date"):
+            add_errors(errors, present & ~parse_dates(values)[2],
+                       spec.get("message", f"{label} must be MM/DD/YYYY or MM/YYYY."))
+        if "suffixes" in spec:
+            suffixes = tuple(suffix.lower() for suffix in spec["suffixes"])
+            add_errors(errors, present & ~values.str.lower().str.endswith(suffixes),
+                       spec.get("message", f"{label} must end with one of: {', '.join(suffixes)}."))
+        if seen is not None:
+            repeated = present & (values.duplicated() | values.isin(seen))
+            add_errors(errors, repeated, f"{label} is a duplicate.")
+            seen.update(values[present].tolist())
+
+    return check
+
+
+# Function to turn a not_before rule into a checker over a whole frame
+def compile_column_order(name, spec, schema):
+    other = spec["not_before"]
+    message = f"{spec.get('label', name)} must not be before {schema[other].get('label', other)}."
+
+    def check(frame, errors):
+        if name not in frame or other not in frame:
+            return
+        months, days, valid = parse_dates(frame[name])
+        first_months, first_days, first_valid = parse_dates(frame[other])
+        both_days = (days != NO_DAY) & (first_days != NO_DAY)
+        before = np.where(both_days, days < first_days, months < first_months)
+        add_errors(errors, valid & first_valid & before, message)
+
+    return check
+
+
+class ColumnValidator:
+    """Vectorised counterpart of ``Validator`` for DataFrames of records.
+
+    Every rule runs once over a whole column rather than once per value.
+    ``validate`` returns an array with each row's error messages joined by
+    "; ", empty for valid rows. Unique fields remember the values of earlier
+    frames, so one validator checks a whole stream of chunks. ``record_checks``
+    are extra callables taking (frame, errors) for rules across fields.
+    """
+
+    def __init__(self, schema, record_checks=()):
+        self.fields = list(schema)
+        self.checkers = [(name, compile_column(name, spec)) for name, spec in schema.items()]
+        self.record_checks = [compile_column_order(name, spec, schema) for name, spec in schema.items()
+                              if "not_before" in spec] + list(record_checks)
+
+    def validate(self, frame):
+        errors = np.full(len(frame), "", dtype=object)
+        for name, check in self.checkers:
+            if name in frame:
+                values = frame[name].fillna("").astype(str).str.strip()
+            else:
+                values = pd.Series("", index=frame.index, dtype=str)
+            check(values, errors)
+        for check in self.record_checks:
+            check(frame, errors)
+        return pd.Series(errors, dtype=object).str.removesuffix("; ").to_numpy(dtype=object)
+
+
+resume_builder_validator = Validator(RESUME_BUILDER_SCHEMA)
+professional_details_validator = Validator(PROFESSIONAL_DETAILS_SCHEMA)
+project_validator = Validator(PROJECT_SCHEMA)
@@ -1,39 +1,298 @@
+import os
+
 import gradio as gr
 import pandas as pd
 
-def analyze_dataframe():
-    # Read the iris.csv file from the current folder
-    try:
-        file_path = "C:/PythonBegineer/iris.csv"
-        headers = ['sepal_length', 'sepal_width', 'petal_length', 'petal_width', 'species']
-        df = pd.read_csv(file_path, header=None, names=headers)
-    except Exception as e:
-        return f"Error reading file: {e}", None, None, None
+from csv_cache import ensure_converted, iter_cached_chunks
+from correlation_outliers import CorrelationOutlierAnalyzer
+from csv_schema import get_schema, iter_csv
+from group_aggregation import AGGREGATIONS, DEFAULT_MEMORY_BUDGET_MB, aggregate_chunks, pivot_aggregate
+from lazy_query import LazyQuery
+from parallel_stats import parallel_summarize_csv
+from request_pool import DEFAULT_REQUEST_BUDGET_MB, AnalysisPool, fit_chunk_size
+from result_cache import ResultCache, result_key
+from sampling_stats import DEFAULT_SAMPLE_SIZE, SAMPLING_CHUNK_SIZE, progressive_statistics, quick_preview
+from streaming_stats import DEFAULT_CHUNK_SIZE, describe_summaries, summarize_chunks, summarize_csv
+
+# Directory the "CSV path on the server" boxes may read from, e.g. ANALYZER_DATA_DIR=/srv/data;
+# defaults to the data directory next to this script, never the directory holding the code
+DATA_DIR = os.path.realpath(os.environ.get("ANALYZER_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")))
+
+# Sample dataset shipped next to this script
+DEFAULT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Iris.csv")
+
+# Outputs are memoised per file fingerprint and option set
+result_cache = ResultCache()
+
+# Heavy work runs on a bounded pool so concurrent users cannot exhaust the server;
+# identical requests already in progress share one computation
+analysis_pool = AnalysisPool()
+
+# Gradio queue limits for the async handlers
+QUEUE_CONCURRENCY = 16
+QUEUE_MAX_SIZE = 64
+
+# Function to pick the file to analyse: an upload wins, then a path inside DATA_DIR, then the sample dataset.
+# Typed paths are resolved relative to DATA_DIR, and any that end up outside it are refused.
+def input_path(uploaded_file, file_path):
+    if uploaded_file:
+        return uploaded_file
+    if not file_path or file_path == DEFAULT_FILE:
+        return DEFAULT_FILE
+    resolved = os.path.realpath(os.path.join(DATA_DIR, file_path))
+    if os.path.commonpath([resolved, DATA_DIR]) != DATA_DIR:
+        raise gr.Error(f"Only files inside {DATA_DIR} can be read from the server.")
+    return resolved
+
+def read_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE, use_cache=True):
+    cached_path = ensure_converted(file_path) if use_cache else None
+    if cached_path:
+        return iter_cached_chunks(cached_path, get_schema(file_path), chunk_size)
+    # Files the binary copy could not be made of usually have values the schema sample missed,
+    # so the CSV reader continues untyped when a chunk does not fit the inferred dtypes
+    return iter_csv(file_path, chunk_size)
+
+def build_query(file_path, columns, filters, row_limit, use_cache):
+    query = LazyQuery(file_path, columns=split_names(columns), use_cache=use_cache)
+    for condition in (filters or "").splitlines():
+        if condition.strip():
+            query = query.filter(condition)
+    return query.limit(row_limit) if row_limit else query
+
+def compute_statistics(file_path, chunk_size, workers, use_cache, columns="", filters="", row_limit=0):
+    # Column selections, filters and limits are pushed into the reader
+    if columns or filters.strip() or row_limit:
+        query = build_query(file_path, columns, filters, row_limit, use_cache)
+        summaries, preview = summarize_chunks(query.iter_chunks(chunk_size))
+        return [describe_summaries(summaries).to_string(), list(summaries), preview.to_string()]
 
-    # Get basic statistics
-    stats = df.describe().to_string()
+    # Repeat analyses read a memory-mapped binary copy instead of re-parsing the text
+    cached_path = ensure_converted(file_path) if use_cache else None
+    # Otherwise stream the file in chunks so memory stays constant whatever its size;
+    # with several workers each process streams its own byte range of the file
+    if cached_path:
+        summaries, preview = summarize_chunks(iter_cached_chunks(cached_path, get_schema(file_path), chunk_size))
+    elif workers > 1:
+        summaries, preview = parallel_summarize_csv(file_path, workers=workers, chunk_size=chunk_size)
+    else:
+        summaries, preview = summarize_csv(file_path, chunk_size=chunk_size)
+
+    # Get basic statistics (quartiles are exact for columns of fewer than DEFAULT_SKETCH_K values,
+    # which the quantile sketch keeps uncompacted, and approximate beyond that)
+    stats = describe_summaries(summaries).to_string()
 
     # Get column names
-    columns = df.columns.tolist()
+    columns = list(summaries)
 
     # Get the first few rows
-    preview = df.head().to_string()
+    preview = preview.to_string()
+
+    return [stats, columns, preview]
+
+def compute_and_cache(key, *args):
+    result = compute_statistics(*args)
+    result_cache.put(key, result)
+    return result
+
+def format_metrics():
+    cache = result_cache.metrics()
+    pool = analysis_pool.metrics()
+    return (f"Cache - memory hits: {cache['memory_hits']}, disk hits: {cache['disk_hits']}, "
+            f"misses: {cache['misses']}, hit rate: {cache['hit_rate']:.0%}\n"
+            f"Queue - waiting: {pool['queued']}, running: {pool['running']}, completed: {pool['completed']}, "
+            f"shared: {pool['shared']}, wait p50: {pool['wait_p50']:.2f}s, "
+            f"latency p50/p95: {pool['latency_p50']:.2f}s/{pool['latency_p95']:.2f}s")
+
+async def analyze_dataframe(uploaded_file=None, file_path=DEFAULT_FILE, chunk_size=DEFAULT_CHUNK_SIZE, workers=1, use_cache=True,
+                            columns="", filters="", row_limit=0, budget_mb=DEFAULT_REQUEST_BUDGET_MB):
+    chunk_size, workers, use_cache = int(chunk_size), int(workers), bool(use_cache)
+    columns, filters, row_limit = (columns or "").strip(), filters or "", int(row_limit or 0)
+    try:
+        # An uploaded file wins over the path box; fall back to the sample dataset
+        file_path = input_path(uploaded_file, file_path)
+        # Keep the rows held at once within this request's memory budget
+        chunk_size = fit_chunk_size(file_path, chunk_size, float(budget_mb), workers)
+        key = result_key(file_path, chunk_size=chunk_size, workers=workers, use_cache=use_cache,
+                         columns=columns, filters=filters, row_limit=row_limit)
+        result = result_cache.get(key)
+        if result is None:
+            result = await analysis_pool.run(
+                key, compute_and_cache, key, file_path, chunk_size, workers, use_cache, columns, filters, row_limit
+            )
+    except Exception as e:
+        return f"Error reading file: {e}", None, None, format_metrics()
+
+    stats, columns, preview = result
+    return stats, columns, preview, format_metrics()
+
+def split_names(text):
+    return [name.strip() for name in (text or "").split(",") if name.strip()]
 
-    return stats, columns, preview
+# Function to fit the rows read at once to a request's memory budget, as a Gradio error if even one row does not fit
+def budget_chunk_size(file_path, chunk_size, budget_mb):
+    try:
+        return fit_chunk_size(file_path, chunk_size, float(budget_mb))
+    except MemoryError as e:
+        raise gr.Error(str(e))
+
+async def group_dataframe(uploaded_file=None, file_path=DEFAULT_FILE, group_by="Species", value_columns="",
+                          aggregations=AGGREGATIONS, pivot_column="", memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+                          budget_mb=DEFAULT_REQUEST_BUDGET_MB):
+    file_path = input_path(uploaded_file, file_path)
+    keys = split_names(group_by)
+    if not keys:
+        raise gr.Error("Enter at least one column to group by.")
+    aggregations = list(aggregations) or ["mean"]
+    chunk_size = budget_chunk_size(file_path, DEFAULT_CHUNK_SIZE, budget_mb)
+    key = result_key(file_path, view="group", keys=keys, values=value_columns, aggregations=aggregations,
+                     pivot=pivot_column, budget=memory_budget_mb, chunk_size=chunk_size)
+    return await analysis_pool.run(
+        key, compute_groups, file_path, keys, value_columns, aggregations, pivot_column, memory_budget_mb, chunk_size
+    )
+
+def compute_groups(file_path, keys, value_columns, aggregations, pivot_column, memory_budget_mb, chunk_size=DEFAULT_CHUNK_SIZE):
+    try:
+        aggregated = aggregate_chunks(
+            read_chunks(file_path, chunk_size),
+            keys,
+            split_names(value_columns) or None,
+            aggregations,
+            memory_budget_mb=float(memory_budget_mb),
+        )
+    except (KeyError, MemoryError) as e:
+        raise gr.Error(f"Could not group the file: {e}")
+
+    pivot_column = (pivot_column or "").strip()
+    if pivot_column and aggregated.columns.size:
+        if pivot_column not in keys or len(keys) < 2:
+            raise gr.Error("The pivot column must be one of two or more group-by columns.")
+        # One pivot table per value and aggregation, side by side
+        aggregated = pd.concat(
+            {f"{value} {aggregation}": pivot_aggregate(aggregated, pivot_column, value, aggregation)
+             for value, aggregation in aggregated.columns},
+            axis=1,
+        )
+    aggregated.columns = [" ".join(map(str, column)) for column in aggregated.columns.to_flat_index()]
+    return aggregated.reset_index()
+
+async def correlation_report(uploaded_file=None, file_path=DEFAULT_FILE, columns="", exact_counts=False,
+                             budget_mb=DEFAULT_REQUEST_BUDGET_MB):
+    file_path, exact_counts = input_path(uploaded_file, file_path), bool(exact_counts)
+    chunk_size = budget_chunk_size(file_path, DEFAULT_CHUNK_SIZE, budget_mb)
+    key = result_key(file_path, view="correlation", columns=columns, exact_counts=exact_counts, chunk_size=chunk_size)
+    return await analysis_pool.run(key, compute_correlations, file_path, columns, chunk_size, exact_counts)
+
+def compute_correlations(file_path, columns, chunk_size=DEFAULT_CHUNK_SIZE, exact_counts=False):
+    dtypes = get_schema(file_path)["dtypes"]
+    columns = split_names(columns) or [column for column, dtype in dtypes.items() if dtype in ("int64", "float32")]
+    unknown = [column for column in columns if column not in dtypes]
+    if unknown or not columns:
+        raise gr.Error(f"Unknown or missing numeric columns: {', '.join(unknown) or 'none found'}")
+    analyzer = CorrelationOutlierAnalyzer(columns).fit(lambda: read_chunks(file_path, chunk_size), exact_counts)
+    return (
+        analyzer.pearson().round(4).reset_index(names="column"),
+        analyzer.spearman().round(4).reset_index(names="column"),
+        analyzer.outliers().round(4).reset_index(),
+    )
+
+async def quick_look(uploaded_file=None, file_path=DEFAULT_FILE, preview_rows=5, sample_size=DEFAULT_SAMPLE_SIZE,
+                     budget_mb=DEFAULT_REQUEST_BUDGET_MB):
+    # A generator, so Gradio shows each refined estimate as soon as it is ready;
+    # the reading itself runs on the analysis pool like every other tab
+    try:
+        file_path = input_path(uploaded_file, file_path)
+        chunk_size = fit_chunk_size(file_path, SAMPLING_CHUNK_SIZE, float(budget_mb))
+        key = result_key(file_path, view="preview", rows=int(preview_rows))
+        preview = (await analysis_pool.run(key, quick_preview, file_path, int(preview_rows))).to_string()
+    except Exception as e:
+        yield f"Error reading file: {e}", None, ""
+        return
+    yield preview, None, "Sampling..."
+    async for statistics, status, _ in analysis_pool.stream(progressive_statistics, file_path, int(sample_size), chunk_size):
+        yield preview, statistics.round(4), status
 
 # Define the Gradio interface
-interface = gr.Interface(
+statistics_interface = gr.Interface(
     fn=analyze_dataframe,
-    inputs=None,  # No file upload needed
+    inputs=[
+        gr.File(label="Upload CSV", file_types=[".csv"], type="filepath"),
+        gr.Textbox(label="Or CSV path on the server", value=DEFAULT_FILE),
+        gr.Number(label="Rows per chunk", value=DEFAULT_CHUNK_SIZE, precision=0, minimum=1),
+        gr.Number(label="Worker processes (CSV parsing only)", value=os.cpu_count() or 1, precision=0, minimum=1),
+        gr.Checkbox(label="Use cached binary copy", value=True),
+        gr.Textbox(label="Columns (comma-separated, blank for all)"),
+        gr.Textbox(label="Filters (one per line, e.g. SepalLengthCm >= 5)", lines=3),
+        gr.Number(label="Row limit (0 for no limit)", value=0, precision=0, minimum=0),
+        gr.Number(label="Memory budget for this request (MB)", value=DEFAULT_REQUEST_BUDGET_MB, minimum=1),
+    ],
     outputs=[
         gr.Textbox(label="Basic Statistics"),
         gr.Textbox(label="Column Names"),
         gr.Textbox(label="Preview of DataFrame"),
+        gr.Textbox(label="Cache and Queue Metrics"),
     ],
     title="Pandas DataFrame Analyzer",
-    description="Analyze the Iris dataset directly from the local folder."
+    description="Analyze an uploaded CSV or a CSV on the server, in a single streaming pass."
+)
+
+group_interface = gr.Interface(
+    fn=group_dataframe,
+    inputs=[
+        gr.File(label="Upload CSV", file_types=[".csv"], type="filepath"),
+        gr.Textbox(label="Or CSV path on the server", value=DEFAULT_FILE),
+        gr.Textbox(label="Group by (comma-separated columns)", value="Species"),
+        gr.Textbox(label="Value columns (comma-separated, blank for all numeric)"),
+        gr.CheckboxGroup(label="Aggregations", choices=list(AGGREGATIONS), value=["count", "mean", "std"]),
+        gr.Textbox(label="Pivot column (optional, one of the group-by columns)"),
+        gr.Number(label="Memory budget for the group table (MB)", value=DEFAULT_MEMORY_BUDGET_MB, minimum=1),
+        gr.Number(label="Memory budget for the rows read at once (MB)", value=DEFAULT_REQUEST_BUDGET_MB, minimum=1),
+    ],
+    outputs=gr.Dataframe(label="Grouped Statistics"),
+    title="Grouped Aggregations",
+    description="Group rows by one or more columns and aggregate them in a single hash-aggregation pass."
+)
+
+correlation_interface = gr.Interface(
+    fn=correlation_report,
+    inputs=[
+        gr.File(label="Upload CSV", file_types=[".csv"], type="filepath"),
+        gr.Textbox(label="Or CSV path on the server", value=DEFAULT_FILE),
+        gr.Textbox(label="Numeric columns (comma-separated, blank for all)"),
+        gr.Checkbox(label="Exact outlier counts (one more pass)", value=False),
+        gr.Number(label="Memory budget for this request (MB)", value=DEFAULT_REQUEST_BUDGET_MB, minimum=1),
+    ],
+    outputs=[
+        gr.Dataframe(label="Pearson Correlation"),
+        gr.Dataframe(label="Spearman Correlation (approximate ranks)"),
+        gr.Dataframe(label="Outliers (IQR and robust z-score)"),
+    ],
+    title="Correlation and Outliers",
+    description="Correlation matrices and outlier counts computed in one chunked pass over the file."
+)
+
+quick_look_interface = gr.Interface(
+    fn=quick_look,
+    inputs=[
+        gr.File(label="Upload CSV", file_types=[".csv"], type="filepath"),
+        gr.Textbox(label="Or CSV path on the server", value=DEFAULT_FILE),
+        gr.Number(label="Preview rows", value=5, precision=0, minimum=1),
+        gr.Number(label="Sample size", value=DEFAULT_SAMPLE_SIZE, precision=0, minimum=10),
+        gr.Number(label="Memory budget for this request (MB)", value=DEFAULT_REQUEST_BUDGET_MB, minimum=1),
+    ],
+    outputs=[
+        gr.Textbox(label="Preview (first rows only)"),
+        gr.Dataframe(label="Approximate Statistics (95% confidence intervals)"),
+        gr.Textbox(label="Status"),
+    ],
+    title="Quick Look",
+    description="Instant preview and sampled statistics that refine while the file is scanned."
+)
+
+interface = gr.TabbedInterface(
+    [quick_look_interface, statistics_interface, group_interface, correlation_interface],
+    ["Quick Look", "Statistics", "Group By", "Correlation & Outliers"],
 )
 
 # Launch the Gradio app
-if __name__ == "__main__": 
-    interface.launch()
\ No newline at end of file
+if __name__ == "__main__":
+    interface.queue(default_concurrency_limit=QUEUE_CONCURRENCY, max_size=QUEUE_MAX_SIZE).launch()
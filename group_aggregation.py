@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+AGGREGATIONS = ("count", "sum", "mean", "std", "min", "max")
+
+# Default memory budget for the per-group state
+DEFAULT_MEMORY_BUDGET_MB = 256
+
+# Rough cost of the key and hash table slot kept for each group
+KEY_BYTES_PER_GROUP = 200
+
+# Per-group state is allocated for at least this many groups, then doubled as needed
+MIN_CAPACITY = 1024
+
+
+class GroupAggregator:
+    """Single-pass, sort-free hash aggregation over chunks of a DataFrame.
+
+    Each key column of a chunk is factorised on its own, and the tuples of
+    codes are hashed into dense local group ids by a ``MultiIndex``; one
+    ``get_indexer`` lookup matches them against the groups seen so far, and
+    unseen keys are appended as new groups. Counts, sums and squared deviations are then added per group with
+    ``np.bincount`` and min/max with ``np.fmin.at``/``np.fmax.at``. Only the
+    per-group state is kept, in arrays whose capacity doubles as groups
+    arrive, so memory depends on the number of groups, not on the number of
+    rows.
+    """
+
+    def __init__(self, keys, values, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB):
+        self.keys = list(keys)
+        self.values = list(values)
+        bytes_per_group = KEY_BYTES_PER_GROUP + len(self.values) * 5 * 8
+        self.max_groups = int(memory_budget_mb * 1024 * 1024 // bytes_per_group)
+        self.group_keys = None  # MultiIndex of the key tuples; position = global group id
+        self.groups = 0
+        width = len(self.values)
+        self.count = np.zeros((width, 0))
+        self.mean = np.zeros((width, 0))
+        self.m2 = np.zeros((width, 0))
+        self.min = np.zeros((width, 0))
+        self.max = np.zeros((width, 0))
+
+    # Function to make room for the given number of groups, at least doubling the capacity
+    def _reserve(self, groups):
+        capacity = self.count.shape[1]
+        if groups <= capacity:
+            return
+        extra = max(groups, 2 * capacity, MIN_CAPACITY) - capacity
+        width = len(self.values)
+        self.count = np.hstack([self.count, np.zeros((width, extra))])
+        self.mean = np.hstack([self.mean, np.zeros((width, extra))])
+        self.m2 = np.hstack([self.m2, np.zeros((width, extra))])
+        self.min = np.hstack([self.min, np.full((width, extra), np.nan)])
+        self.max = np.hstack([self.max, np.full((width, extra), np.nan)])
+
+    # Function to map a chunk's rows to global group ids, adding groups for unseen keys.
+    # Returns (rows with every key present, local group id per such row, global id per local group).
+    def _map_groups(self, chunk):
+        key_frame = chunk[self.keys]
+        valid = key_frame.notna().all(axis=1).to_numpy()  # Rows with a missing key are dropped
+        factorized = [pd.factorize(key_frame[key][valid]) for key in self.keys]
+        keys = pd.MultiIndex(
+            levels=[uniques for _, uniques in factorized],
+            codes=[codes for codes, _ in factorized],
+            verify_integrity=False,
+        )
+        local_keys = keys.unique()
+        local_ids = local_keys.get_indexer(keys)
+        if self.group_keys is None:
+            self.group_keys = local_keys[:0]
+        mapping = self.group_keys.get_indexer(local_keys)
+        unseen = np.flatnonzero(mapping < 0)
+        if len(unseen):
+            if self.groups + len(unseen) > self.max_groups:
+                raise MemoryError(f"More than {self.max_groups} groups do not fit the memory budget")
+            mapping[unseen] = np.arange(self.groups, self.groups + len(unseen))
+            self.group_keys = self.group_keys.append(local_keys[unseen])
+            self._reserve(self.groups + len(unseen))
+            self.groups += len(unseen)
+        return valid, local_ids, mapping
+
+    def update(self, chunk):
+        valid, local_ids, mapping = self._map_groups(chunk)
+        groups = len(mapping)
+        for row, value in enumerate(self.values):
+            data = pd.to_numeric(chunk[value], errors="coerce").to_numpy(dtype=np.float64)[valid]
+            present = ~np.isnan(data)
+            filled = np.where(present, data, 0.0)
+            count = np.bincount(local_ids, weights=present, minlength=groups)
+            total = np.bincount(local_ids, weights=filled, minlength=groups)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = np.where(count > 0, total / count, 0.0)
+            deviation = np.where(present, data - mean[local_ids], 0.0)
+            m2 = np.bincount(local_ids, weights=deviation * deviation, minlength=groups)
+            minimum = np.full(groups, np.nan)
+            maximum = np.full(groups, np.nan)
+            np.fmin.at(minimum, local_ids, data)
+            np.fmax.at(maximum, local_ids, data)
+
+            # Chan's parallel update of the running mean and squared deviations
+            old_count = self.count[row, mapping]
+            new_count = old_count + count
+            delta = mean - self.mean[row, mapping]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                weight = np.where(new_count > 0, count / new_count, 0.0)
+            self.mean[row, mapping] += delta * weight
+            self.m2[row, mapping] += m2 + delta * delta * old_count * weight
+            self.count[row, mapping] = new_count
+            self.min[row, mapping] = np.fmin(self.min[row, mapping], minimum)
+            self.max[row, mapping] = np.fmax(self.max[row, mapping], maximum)
+
+    def result(self, aggregations=AGGREGATIONS):
+        index = self.group_keys.set_names(self.keys)
+        if len(self.keys) == 1:
+            index = index.get_level_values(0)
+        columns = {}
+        used = slice(0, self.groups)
+        for row, value in enumerate(self.values):
+            count, mean = self.count[row, used], self.mean[row, used]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                computed = {
+                    "count": count,
+                    "sum": mean * count,
+                    "mean": np.where(count > 0, mean, np.nan),
+                    "std": np.where(count > 1, np.sqrt(self.m2[row, used] / (count - 1)), np.nan),
+                    "min": self.min[row, used],
+                    "max": self.max[row, used],
+                }
+            for aggregation in aggregations:
+                columns[(value, aggregation)] = computed[aggregation]
+        return pd.DataFrame(columns, index=index).sort_index()
+
+
+# Function to aggregate a stream of chunks by the given key columns
+def aggregate_chunks(chunks, keys, values=None, aggregations=AGGREGATIONS, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB):
+    aggregator = None
+    for chunk in chunks:
+        if aggregator is None:
+            if values is None:
+                values = [
+                    column for column in chunk.columns
+                    if column not in keys and pd.api.types.is_numeric_dtype(chunk[column])
+                ]
+            aggregator = GroupAggregator(keys, values, memory_budget_mb)
+        aggregator.update(chunk)
+    if aggregator is None:
+        return pd.DataFrame()
+    return aggregator.result(aggregations)
+
+
+# Function to pivot one aggregated value so that a key column becomes the columns
+def pivot_aggregate(aggregated, pivot_key, value, aggregation):
+    return aggregated[(value, aggregation)].unstack(pivot_key)
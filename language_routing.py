@@ -0,0 +1,71 @@
+import re
+from functools import lru_cache
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from sumy.utils import get_stop_words
+
+from bm25_scorer import BM25FIndex
+
+# Languages we route to; each has a Sumy tokenizer and stop-word list
+SUPPORTED_LANGUAGES = ("english", "french", "german", "spanish", "italian", "portuguese")
+DEFAULT_LANGUAGE = "english"
+
+# Only the start of a document is needed to tell its language
+DETECTION_SAMPLE_CHARS = 2000
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+
+# Function to return the stop words of a language, loaded once per process
+@lru_cache(maxsize=None)
+def stop_words_for(language):
+    if language == "english":
+        return ENGLISH_STOP_WORDS
+    return frozenset(get_stop_words(language))
+
+
+# Function to guess the language of a text from its stop-word hits
+def detect_language(text, sample_chars=DETECTION_SAMPLE_CHARS):
+    words = WORD_PATTERN.findall(text[:sample_chars].lower())
+    if not words:
+        return DEFAULT_LANGUAGE
+    hits = {
+        language: sum(word in stop_words_for(language) for word in words)
+        for language in SUPPORTED_LANGUAGES
+    }
+    best = max(SUPPORTED_LANGUAGES, key=lambda language: hits[language])
+    return best if hits[best] else DEFAULT_LANGUAGE
+
+
+class LanguageShardedIndex:
+    """One BM25F index per language; queries only search their own language's shard."""
+
+    def __init__(self, documents, languages, **index_options):
+        self.shards = {}
+        self.doc_ids = {}  # language -> global doc id of each shard document
+        for language in set(languages):
+            doc_ids = [doc_id for doc_id, doc_language in enumerate(languages) if doc_language == language]
+            self.doc_ids[language] = doc_ids
+            self.shards[language] = BM25FIndex(
+                [documents[doc_id] for doc_id in doc_ids],
+                stop_words=stop_words_for(language),
+                **index_options,
+            )
+
+    # Function to return the top-k (global doc id, score) pairs from the query's language shard
+    def search(self, query, k=10, language=None):
+        language = language or detect_language(query)
+        if language not in self.shards:
+            return []
+        doc_ids = self.doc_ids[language]
+        return [(doc_ids[shard_id], score) for shard_id, score in self.shards[language].search(query, k)]
+
+    # Function to rank every document of the query's language shard; returns (global doc id, score) pairs, best first
+    def rank(self, query, language=None):
+        language = language or detect_language(query)
+        if language not in self.shards:
+            return []
+        doc_ids = self.doc_ids[language]
+        scores = self.shards[language].score_all(query)
+        order = sorted(range(len(scores)), key=lambda shard_id: (-scores[shard_id], shard_id))
+        return [(doc_ids[shard_id], scores[shard_id]) for shard_id in order]
@@ -0,0 +1,135 @@
+import operator
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.fs
+
+from csv_cache import ensure_converted
+from csv_schema import get_schema, iter_csv
+from streaming_stats import DEFAULT_CHUNK_SIZE
+
+OPERATORS = {
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# A filter is "column op value", e.g. "SepalLengthCm >= 5" or "Species == Iris-setosa"
+FILTER_PATTERN = re.compile(r"^\s*`?(?P<column>[^`<>=!]+?)`?\s*(?P<op>==|!=|<=|>=|<|>|=)\s*(?P<value>.+?)\s*$")
+
+NUMERIC_DTYPES = ("int64", "float32")
+
+
+# Function to parse one "column op value" filter against a file's schema
+def parse_filter(text, schema):
+    match = FILTER_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Cannot parse filter: {text!r}")
+    column, op, value = match.group("column").strip(), match.group("op"), match.group("value").strip("'\"")
+    if column not in schema["dtypes"]:
+        raise ValueError(f"Unknown column in filter: {column!r}")
+    if schema["dtypes"][column] == "float32":
+        # Compare at the column's own precision so "== 6.9" matches a stored float32 6.9
+        value = np.float32(value)
+    elif schema["dtypes"][column] in NUMERIC_DTYPES:
+        value = float(value)
+    return column, op, value
+
+
+class LazyQuery:
+    """Deferred select/filter/limit over a CSV file.
+
+    Nothing is read until ``iter_chunks`` or ``collect``. Only the selected and
+    filtered columns are parsed; on the cached Arrow copy the filters are also
+    pushed into the scanner so non-matching rows are never converted to pandas.
+    """
+
+    def __init__(self, file_path, columns=None, filters=(), limit=None, use_cache=True):
+        self.file_path = file_path
+        self.schema = get_schema(file_path)
+        self.columns = list(columns) if columns else list(self.schema["columns"])
+        self.filters = list(filters)
+        self.row_limit = limit
+        self.use_cache = use_cache
+        unknown = [column for column in self.columns if column not in self.schema["dtypes"]]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+
+    def _copy(self, **changes):
+        options = {"columns": self.columns, "filters": self.filters, "limit": self.row_limit, "use_cache": self.use_cache}
+        options.update(changes)
+        return LazyQuery(self.file_path, **options)
+
+    def select(self, *columns):
+        return self._copy(columns=columns)
+
+    # Function to add a filter, given as "column op value" text or a (column, op, value) tuple
+    def filter(self, condition):
+        if isinstance(condition, str):
+            condition = parse_filter(condition, self.schema)
+        return self._copy(filters=self.filters + [condition])
+
+    def limit(self, rows):
+        return self._copy(limit=rows)
+
+    def _needed_columns(self):
+        needed = list(self.columns)
+        for column, _, _ in self.filters:
+            if column not in needed:
+                needed.append(column)
+        return needed
+
+    def _arrow_filter(self):
+        expression = None
+        for column, op, value in self.filters:
+            condition = OPERATORS[op](ds.field(column), value)
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def _mask(self, chunk):
+        mask = pd.Series(True, index=chunk.index)
+        for column, op, value in self.filters:
+            mask &= OPERATORS[op](chunk[column], value)
+        return mask
+
+    def _raw_chunks(self, chunk_size):
+        needed = self._needed_columns()
+        cached_path = ensure_converted(self.file_path) if self.use_cache else None
+        if cached_path:
+            dataset = ds.dataset(cached_path, format="ipc", filesystem=pyarrow.fs.LocalFileSystem(use_mmap=True))
+            scanner = dataset.scanner(columns=self.columns, filter=self._arrow_filter(), batch_size=chunk_size)
+            categories = [c for c in self.columns if self.schema["dtypes"][c] == "category"]
+            for batch in scanner.to_batches():
+                chunk = batch.to_pandas()
+                for column in categories:
+                    chunk[column] = chunk[column].astype("category")
+                yield chunk
+            return
+        # Continues untyped if rows beyond the schema sample do not fit the inferred dtypes
+        schema = {**self.schema, "dtypes": {column: self.schema["dtypes"][column] for column in needed}}
+        for chunk in iter_csv(self.file_path, chunk_size, schema, usecols=needed):
+            yield chunk[self._mask(chunk)][self.columns]
+
+    # Function to run the query and yield the matching rows chunk by chunk
+    def iter_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        remaining = self.row_limit
+        for chunk in self._raw_chunks(chunk_size):
+            if remaining is not None:
+                chunk = chunk.iloc[:remaining]
+                remaining -= len(chunk)
+            if len(chunk):
+                yield chunk
+            if remaining is not None and remaining <= 0:
+                return
+
+    def collect(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        chunks = list(self.iter_chunks(chunk_size))
+        if not chunks:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(chunks, ignore_index=True)
@@ -0,0 +1,209 @@
+from functools import lru_cache
+
+import numpy as np
+
+from locations import get_locations
+
+# Mean radius of the Earth in kilometres
+EARTH_RADIUS_KM = 6371.0088
+
+# Kilometres per degree of latitude
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+
+# Side of a grid cell in degrees
+DEFAULT_CELL_DEGREES = 1.0
+
+# Point-to-city distances computed at once by a batched query
+BLOCK_CELLS = 4_000_000
+
+# A batched query's search around one cell of points costs about as much as this many distances
+GROUP_SEARCH_PAIRS = 20_000
+
+
+# Function to return great-circle distances in km; arguments are degrees and broadcast like numpy arrays
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class CityGrid:
+    """Grid index over the city coordinates of a location index.
+
+    Cities are bucketed into cells of ``cell_degrees`` by ``cell_degrees`` and
+    stored sorted by cell id, with the distinct cell ids and their offsets
+    kept CSR-style. A query only computes haversine distances for the cities
+    in the cells its search box touches. Results are positions into the
+    index's city arrays, nearest first, with distances in km.
+    """
+
+    def __init__(self, index, cell_degrees=DEFAULT_CELL_DEGREES):
+        self.index = index
+        self.cell_degrees = cell_degrees
+        self.rows = int(np.ceil(180 / cell_degrees)) + 1
+        self.columns = int(np.ceil(360 / cell_degrees))
+        cells = self.cell_ids(np.asarray(index.latitudes), np.asarray(index.longitudes))
+        self.order = np.argsort(cells, kind="stable")
+        self.cell_keys, starts = np.unique(cells[self.order], return_index=True)
+        self.cell_offsets = np.append(starts, len(cells)).astype(np.int64)
+        self.key_rows, self.key_columns = np.divmod(self.cell_keys, self.columns)
+        self.latitudes = np.asarray(index.latitudes, dtype=np.float64)[self.order]
+        self.longitudes = np.asarray(index.longitudes, dtype=np.float64)[self.order]
+
+    def cell_ids(self, latitudes, longitudes):
+        rows = np.floor((np.asarray(latitudes) + 90) / self.cell_degrees).astype(np.int64)
+        columns = np.floor((np.asarray(longitudes) + 180) / self.cell_degrees).astype(np.int64) % self.columns
+        return rows * self.columns + columns
+
+    # Function to return the ids of the cells within the given (inclusive) cell row and column ranges
+    def box_cells(self, row_range, column_range):
+        rows = np.arange(max(row_range[0], 0), min(row_range[1], self.rows - 1) + 1)
+        if column_range[1] - column_range[0] + 1 >= self.columns:
+            columns = np.arange(self.columns)
+        else:
+            columns = np.arange(column_range[0], column_range[1] + 1) % self.columns
+        return np.unique(rows[:, None] * self.columns + columns[None, :])
+
+    # Function to return the ids of the cells that can hold points within radius_km of a point
+    def cells_within(self, latitude, longitude, radius_km):
+        return self.box_cells(*self.ranges_near((latitude, latitude), (longitude, longitude), radius_km))
+
+    # Function to return the (inclusive) cell row and column ranges that can hold points within
+    # radius_km of any point in the given latitude and longitude ranges
+    def ranges_near(self, lat_range, lon_range, radius_km):
+        lat_span = radius_km / KM_PER_DEGREE
+        # Near the poles a small radius can cross every meridian
+        cos_lat = np.cos(np.radians(min(max(abs(lat_range[0]), abs(lat_range[1])) + lat_span, 90.0)))
+        lon_span = 360.0 if cos_lat * KM_PER_DEGREE * 180 <= radius_km else radius_km / (KM_PER_DEGREE * cos_lat)
+        row_range = (int(np.floor((lat_range[0] - lat_span + 90) / self.cell_degrees)),
+                     int(np.floor((lat_range[1] + lat_span + 90) / self.cell_degrees)))
+        column_range = (int(np.floor((lon_range[0] - lon_span + 180) / self.cell_degrees)),
+                        int(np.floor((lon_range[1] + lon_span + 180) / self.cell_degrees)))
+        return row_range, column_range
+
+    # Function to return the grid positions of the cities in the given slots of cell_keys
+    def _slot_positions(self, slots):
+        starts, stops = self.cell_offsets[slots], self.cell_offsets[slots + 1]
+        counts = stops - starts
+        if not counts.sum():
+            return np.empty(0, dtype=np.int64)
+        # One arange over all slots: each slot's run restarts at its own offset
+        return np.arange(counts.sum()) + np.repeat(starts - np.cumsum(counts) + counts, counts)
+
+    # Function to return the grid positions of the cities in the given cells
+    def _candidates(self, cells):
+        slots = np.searchsorted(self.cell_keys, cells)
+        found = slots < len(self.cell_keys)
+        found[found] = self.cell_keys[slots[found]] == cells[found]
+        return self._slot_positions(slots[found])
+
+    # Function to return the grid positions of the cities in the given (inclusive) cell row and column
+    # ranges. Small boxes look their cells up; boxes with more cells than hold cities scan those instead.
+    def _box_candidates(self, row_range, column_range):
+        width = column_range[1] - column_range[0]
+        area = (row_range[1] - row_range[0] + 1) * min(width + 1, self.columns)
+        if area <= len(self.cell_keys):
+            return self._candidates(self.box_cells(row_range, column_range))
+        inside = (self.key_rows >= row_range[0]) & (self.key_rows <= row_range[1])
+        if width + 1 < self.columns:
+            inside &= (self.key_columns - column_range[0]) % self.columns <= width
+        return self._slot_positions(np.flatnonzero(inside))
+
+    # Function to return (positions, distances) of the cities within radius_km of a point, nearest first
+    def within_radius(self, latitude, longitude, radius_km):
+        candidates = self._candidates(self.cells_within(latitude, longitude, radius_km))
+        distances = haversine_km(latitude, longitude, self.latitudes[candidates], self.longitudes[candidates])
+        keep = distances <= radius_km
+        candidates, distances = candidates[keep], distances[keep]
+        ranked = np.argsort(distances, kind="stable")
+        return self.order[candidates[ranked]], distances[ranked]
+
+    # Function to return (positions, distances) of the k cities nearest to a point
+    def nearest(self, latitude, longitude, k=1):
+        k = min(k, len(self.order))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        row = int(np.floor((latitude + 90) / self.cell_degrees))
+        column = int(np.floor((longitude + 180) / self.cell_degrees))
+        # Grow a box of cells until it holds k cities, then search the exact radius of the k-th of them
+        ring = 0
+        while True:
+            candidates = self._box_candidates((row - ring, row + ring), (column - ring, column + ring))
+            if len(candidates) >= k or (ring >= self.rows and 2 * ring + 1 >= self.columns):
+                break
+            ring = ring * 2 + 1
+        distances = haversine_km(latitude, longitude, self.latitudes[candidates], self.longitudes[candidates])
+        radius = np.partition(distances, k - 1)[k - 1]
+        positions, distances = self.within_radius(latitude, longitude, radius)
+        return positions[:k], distances[:k]
+
+    # Function to return, for each point, the nearest of the candidate cities as (grid positions, distances).
+    # Points are handled in blocks so at most block_cells distances are held at once.
+    def _nearest_candidates(self, latitudes, longitudes, candidates, block_cells=BLOCK_CELLS):
+        best = np.empty(len(latitudes), dtype=np.int64)
+        distances = np.empty(len(latitudes))
+        block = max(1, block_cells // max(len(candidates), 1))
+        for start in range(0, len(latitudes), block):
+            stop = start + block
+            matrix = haversine_km(latitudes[start:stop, None], longitudes[start:stop, None],
+                                  self.latitudes[candidates][None, :], self.longitudes[candidates][None, :])
+            nearest = matrix.argmin(axis=1)
+            best[start:stop] = candidates[nearest]
+            distances[start:stop] = matrix[np.arange(len(nearest)), nearest]
+        return best, distances
+
+    # Function to return the nearest city to each of many points, as (positions, distances) arrays.
+    # Points are grouped by grid cell and each group is searched like ``nearest``: a box of cells
+    # grows until it holds a city, which bounds the distance each point still has to search, and
+    # the cells within that distance of the group are then compared exactly. When there are too
+    # few cities for that to pay off, every point is compared with every city instead.
+    def nearest_many(self, latitudes, longitudes, block_cells=BLOCK_CELLS):
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        positions = np.empty(len(latitudes), dtype=np.int64)
+        distances = np.empty(len(latitudes))
+        if not len(latitudes):
+            return positions, distances
+        cells = self.cell_ids(latitudes, longitudes)
+        point_order = np.argsort(cells, kind="stable")
+        group_cells, group_starts = np.unique(cells[point_order], return_index=True)
+        if len(latitudes) * len(self.order) <= len(group_cells) * GROUP_SEARCH_PAIRS:
+            # Few cities for the points given: comparing every point with every city is cheaper
+            best, distances = self._nearest_candidates(latitudes, longitudes, np.arange(len(self.order)), block_cells)
+            return self.order[best], distances
+        group_ends = np.append(group_starts[1:], len(point_order))
+        for cell, start, stop in zip(group_cells, group_starts, group_ends):
+            points = point_order[start:stop]
+            group_lats, group_lons = latitudes[points], longitudes[points]
+            row, column = divmod(int(cell), self.columns)
+            ring = 0
+            while True:
+                candidates = self._box_candidates((row - ring, row + ring), (column - ring, column + ring))
+                if len(candidates) or (ring >= self.rows and 2 * ring + 1 >= self.columns):
+                    break
+                ring = ring * 2 + 1
+            _, bounds = self._nearest_candidates(group_lats, group_lons, candidates, block_cells)
+            candidates = self._box_candidates(*self.ranges_near(
+                (group_lats.min(), group_lats.max()), (group_lons.min(), group_lons.max()), bounds.max()
+            ))
+            best, distances[points] = self._nearest_candidates(group_lats, group_lons, candidates, block_cells)
+            positions[points] = self.order[best]
+        return positions, distances
+
+    # Function to return the (country, state, city) names of a position in the city arrays
+    def describe(self, position):
+        state = int(np.searchsorted(self.index.state_offsets, position, side="right")) - 1
+        country = int(np.searchsorted(self.index.country_offsets, state, side="right")) - 1
+        return (str(self.index.countries_array[country]), str(self.index.states_array[state]),
+                str(self.index.cities_array[position]))
+
+    # Function to return (country, state, city, distance km) for the cities nearest to a point
+    def nearest_cities(self, latitude, longitude, k=1):
+        positions, distances = self.nearest(latitude, longitude, k)
+        return [self.describe(p) + (float(d),) for p, d in zip(positions, distances)]
+
+
+# Function to return the process-wide city grid, built on first use
+@lru_cache(maxsize=None)
+def get_city_grid():
+    return CityGrid(get_locations())
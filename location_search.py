@@ -0,0 +1,129 @@
+from functools import lru_cache
+
+import numpy as np
+
+from locations import get_locations
+
+# Matches returned for one query
+DEFAULT_LIMIT = 10
+
+# Share of trigrams two names must have in common to count as a fuzzy match
+MIN_SIMILARITY = 0.3
+
+
+# Function to normalise a name or query for matching
+def normalize(text):
+    return " ".join(str(text).lower().split())
+
+
+# Function to return the set of character trigrams of a name, padded so word edges count
+def trigrams(text):
+    padded = f"  {normalize(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class LocationSearch:
+    """Typeahead search over the states and cities of a location index.
+
+    Prefix matches come from a sorted array of normalised names, found with
+    two binary searches. When there are fewer than the requested number, the
+    rest are filled with typo-tolerant matches from a trigram index, scored by
+    the share of trigrams the query and the name have in common.
+
+    Each match is a dict with ``label``, ``kind`` ("state" or "city"),
+    ``country``, ``state`` and ``city`` (None for states).
+    """
+
+    def __init__(self, index):
+        # One entry per state, then one per city, with the country and state of each
+        state_countries = np.repeat(index.countries_array, np.diff(index.country_offsets))
+        city_states = np.repeat(index.states_array, np.diff(index.state_offsets))
+        city_countries = np.repeat(state_countries, np.diff(index.state_offsets))
+        self.names = np.concatenate([index.states_array, index.cities_array]).astype(str)
+        self.countries = np.concatenate([state_countries, city_countries]).astype(str)
+        self.states = np.concatenate([index.states_array, city_states]).astype(str)
+        self.is_city = np.concatenate([np.zeros(len(index.states_array), dtype=bool),
+                                       np.ones(len(index.cities_array), dtype=bool)])
+        self.keys = np.array([normalize(name) for name in self.names])
+
+        # Prefix index: entries sorted by key, states before cities of the same name
+        self.order = np.lexsort((self.is_city, self.keys))
+        self.sorted_keys = self.keys[self.order]
+
+        # Trigram index: postings for each trigram as one flat array with offsets
+        postings = {}
+        self.trigram_counts = np.zeros(len(self.keys), dtype=np.int32)
+        for entry, key in enumerate(self.keys):
+            grams = trigrams(key)
+            self.trigram_counts[entry] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(entry)
+        self.gram_positions = {gram: i for i, gram in enumerate(postings)}
+        lengths = [len(entries) for entries in postings.values()]
+        self.posting_offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        self.postings = np.fromiter((e for entries in postings.values() for e in entries),
+                                    dtype=np.int32, count=int(self.posting_offsets[-1]))
+
+    def _match(self, entry):
+        name, country, state = str(self.names[entry]), str(self.countries[entry]), str(self.states[entry])
+        if self.is_city[entry]:
+            return {"label": f"{name}, {state}, {country}", "kind": "city",
+                    "country": country, "state": state, "city": name}
+        return {"label": f"{name}, {country}", "kind": "state", "country": country, "state": state, "city": None}
+
+    # Function to return the entries whose names start with the query, in alphabetical order
+    def prefix_entries(self, query, limit=DEFAULT_LIMIT):
+        key = normalize(query)
+        start = np.searchsorted(self.sorted_keys, key, side="left")
+        stop = np.searchsorted(self.sorted_keys, key + "￿", side="right")
+        return self.order[start:min(stop, start + limit)]
+
+    # Function to return the entries most similar to the query by shared trigrams, best first
+    def fuzzy_entries(self, query, limit=DEFAULT_LIMIT, min_similarity=MIN_SIMILARITY):
+        grams = [self.gram_positions[g] for g in trigrams(query) if g in self.gram_positions]
+        if not grams:
+            return np.empty(0, dtype=np.int64)
+        hits = np.concatenate([self.postings[self.posting_offsets[g]:self.posting_offsets[g + 1]] for g in grams])
+        candidates, shared = np.unique(hits, return_counts=True)
+        # Jaccard similarity of the two trigram sets
+        query_count = len(trigrams(query))
+        similarity = shared / (query_count + self.trigram_counts[candidates] - shared)
+        keep = similarity >= min_similarity
+        candidates, similarity = candidates[keep], similarity[keep]
+        if len(candidates) > limit:
+            top = np.argpartition(-similarity, limit - 1)[:limit]
+            candidates, similarity = candidates[top], similarity[top]
+        return candidates[np.lexsort((candidates, -similarity))]
+
+    # Function to return up to limit matches for what the user has typed so far
+    def search(self, query, limit=DEFAULT_LIMIT):
+        if not normalize(query):
+            return []
+        entries = list(self.prefix_entries(query, limit))
+        if len(entries) < limit:
+            seen = set(entries)
+            for entry in self.fuzzy_entries(query, limit):
+                if entry not in seen and len(entries) < limit:
+                    entries.append(entry)
+        return [self._match(entry) for entry in entries]
+
+    # Function to return only the labels of the matches, for plain list widgets
+    def labels(self, query, limit=DEFAULT_LIMIT):
+        return [match["label"] for match in self.search(query, limit)]
+
+    # Function to find the match with the given label, as picked from a list of labels
+    def resolve(self, label):
+        key = normalize(str(label).split(",")[0])
+        start = np.searchsorted(self.sorted_keys, key, side="left")
+        stop = np.searchsorted(self.sorted_keys, key, side="right")
+        for entry in self.order[start:stop]:
+            match = self._match(entry)
+            if match["label"] == label:
+                return match
+        return None
+
+
+# Function to return the process-wide search index, built on first use
+@lru_cache(maxsize=None)
+def get_location_search():
+    return LocationSearch(get_locations())
@@ -0,0 +1,168 @@
+import hashlib
+import os
+import shutil
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from csv_schema import file_fingerprint
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Binary copies of location indexes, next to this script
+LOCATION_CACHE_DIR = os.path.join(BASE_DIR, ".location_cache")
+
+# City datasets with City, State and country columns; add more files to cover more countries
+LOCATION_SOURCES = (
+    os.path.join(BASE_DIR, "Indian_Cities_Database_Kaggle.csv"),
+    os.path.join(BASE_DIR, "Sample_Cities_Database.csv"),
+)
+
+INDEX_ARRAYS = ("countries", "country_offsets", "states", "state_offsets", "cities", "latitudes", "longitudes")
+
+
+class LocationIndex:
+    """Country -> state -> city hierarchy stored as CSR-style arrays.
+
+    ``countries`` is sorted; the states of ``countries[i]`` are
+    ``states[country_offsets[i]:country_offsets[i + 1]]`` and the cities of
+    ``states[j]`` are ``cities[state_offsets[j]:state_offsets[j + 1]]``, each
+    sorted. Dictionaries from names to positions make every child lookup O(1).
+    ``latitudes`` and ``longitudes`` hold the coordinates of each city, in the
+    same order as ``cities``.
+    """
+
+    def __init__(self, countries, country_offsets, states, state_offsets, cities, latitudes, longitudes):
+        self.countries_array = countries
+        self.country_offsets = country_offsets
+        self.states_array = states
+        self.state_offsets = state_offsets
+        self.cities_array = cities
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.country_positions = {str(country): i for i, country in enumerate(countries)}
+        self.state_positions = {}
+        for i, country in enumerate(self.country_positions):
+            for j in range(country_offsets[i], country_offsets[i + 1]):
+                self.state_positions[(country, str(states[j]))] = j
+
+    def countries(self):
+        return list(self.country_positions)
+
+    # Function to return the states of a country as a view into the index arrays, without copying
+    def state_view(self, country):
+        i = self.country_positions.get(country)
+        if i is None:
+            return self.states_array[:0]
+        return self.states_array[self.country_offsets[i]:self.country_offsets[i + 1]]
+
+    # Function to return the cities of a state as a view into the index arrays, without copying
+    def city_view(self, country, state):
+        j = self.state_positions.get((country, state))
+        if j is None:
+            return self.cities_array[:0]
+        return self.cities_array[self.state_offsets[j]:self.state_offsets[j + 1]]
+
+    def states(self, country):
+        return self.state_view(country).tolist()
+
+    def cities(self, country, state):
+        return self.city_view(country, state).tolist()
+
+    def has_state(self, country, state):
+        return (country, state) in self.state_positions
+
+    # Function to return the position of a city in the city arrays, or None if it is unknown
+    def city_position(self, country, state, city):
+        j = self.state_positions.get((country, state))
+        if j is None:
+            return None
+        start, stop = int(self.state_offsets[j]), int(self.state_offsets[j + 1])
+        i = start + int(np.searchsorted(self.cities_array[start:stop], city))
+        return i if i < stop and self.cities_array[i] == city else None
+
+    # Function to return the (latitude, longitude) of a city, or None if it is unknown
+    def coordinates(self, country, state, city):
+        i = self.city_position(country, state, city)
+        if i is None:
+            return None
+        return float(self.latitudes[i]), float(self.longitudes[i])
+
+
+# Function to build the index from a DataFrame with country, State, City, Lat and Long columns, without a Python loop
+def build_location_index(df):
+    countries = df["country"].astype(str).str.strip().to_numpy(dtype=str)
+    states = df["State"].astype(str).str.strip().to_numpy(dtype=str)
+    cities = df["City"].astype(str).str.strip().to_numpy(dtype=str)
+    latitudes = df["Lat"].to_numpy(dtype=np.float64)
+    longitudes = df["Long"].to_numpy(dtype=np.float64)
+    order = np.lexsort((cities, states, countries))
+    countries, states, cities = countries[order], states[order], cities[order]
+    latitudes, longitudes = latitudes[order], longitudes[order]
+
+    # First row of every (country, state) pair, and of every country among those pairs
+    new_state = np.ones(len(cities), dtype=bool)
+    new_state[1:] = (countries[1:] != countries[:-1]) | (states[1:] != states[:-1])
+    state_starts = np.flatnonzero(new_state)
+    state_countries = countries[state_starts]
+    unique_countries, country_starts = np.unique(state_countries, return_index=True)
+
+    return LocationIndex(
+        unique_countries,
+        np.append(country_starts, len(state_starts)).astype(np.int64),
+        states[state_starts],
+        np.append(state_starts, len(cities)).astype(np.int64),
+        cities,
+        latitudes,
+        longitudes,
+    )
+
+
+# Function to load the index for a set of CSVs, from its binary copy when none of them has changed.
+# The copy is a directory named after the set of CSVs and their current versions; it is written
+# under a temporary name and renamed into place, so readers never see a partial copy.
+def load_location_index(csv_files=LOCATION_SOURCES, cache_dir=LOCATION_CACHE_DIR):
+    sources_key = hashlib.sha1("|".join(os.path.abspath(path) for path in csv_files).encode("utf-8")).hexdigest()[:16]
+    key = hashlib.sha1("|".join(file_fingerprint(path) for path in csv_files).encode("utf-8")).hexdigest()
+    index_dir = os.path.join(cache_dir, f"locations-{sources_key}-{key}")
+    paths = {name: os.path.join(index_dir, f"{name}.npy") for name in INDEX_ARRAYS}
+    if os.path.isdir(index_dir):
+        return LocationIndex(*(np.load(paths[name], mmap_mode="r") for name in INDEX_ARRAYS))
+    df = pd.concat(
+        [pd.read_csv(path, usecols=["country", "State", "City", "Lat", "Long"]) for path in csv_files],
+        ignore_index=True,
+    )
+    index = build_location_index(df)
+    arrays = {
+        "countries": index.countries_array,
+        "country_offsets": index.country_offsets,
+        "states": index.states_array,
+        "state_offsets": index.state_offsets,
+        "cities": index.cities_array,
+        "latitudes": index.latitudes,
+        "longitudes": index.longitudes,
+    }
+    os.makedirs(cache_dir, exist_ok=True)
+    # Copies built from older versions of the same CSVs are never read again
+    for name in os.listdir(cache_dir):
+        if name.startswith(f"locations-{sources_key}-") and not name.endswith(".tmp"):
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+    temp_dir = f"{index_dir}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(temp_dir)
+        for name in INDEX_ARRAYS:
+            np.save(os.path.join(temp_dir, f"{name}.npy"), arrays[name])
+        os.replace(temp_dir, index_dir)
+    except OSError:
+        pass  # Another process put its copy in place first
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return index
+
+
+# Function to return the process-wide location index, loaded on first use
+@lru_cache(maxsize=None)
+def get_locations():
+    return load_location_index()
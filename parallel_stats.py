@@ -0,0 +1,87 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from csv_schema import get_schema, read_options
+from streaming_stats import DEFAULT_CHUNK_SIZE, column_kinds, merge_summaries, summaries_for, update_summaries
+
+# Rows read up front to get the column names, column kinds and preview
+SAMPLE_ROWS = 1000
+
+
+class RangeReader(io.RawIOBase):
+    """Binary reader that only exposes bytes [start, end) of a file."""
+
+    def __init__(self, file_path, start, end):
+        self.handle = open(file_path, "rb")
+        self.handle.seek(start)
+        self.remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self.remaining)
+        if size <= 0:
+            return 0
+        data = self.handle.read(size)
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self.handle.close()
+        super().close()
+
+
+# Function to split the data rows of a file into byte ranges that start and end on line breaks.
+# Quoted fields containing line breaks are not supported.
+def byte_ranges(file_path, partitions, has_header=True):
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as handle:
+        if has_header:
+            handle.readline()
+        data_start = handle.tell()
+        boundaries = [data_start]
+        step = max(1, (size - data_start) // partitions)
+        for i in range(1, partitions):
+            handle.seek(max(data_start + i * step, boundaries[-1]))
+            handle.readline()
+            boundaries.append(min(handle.tell(), size))
+        boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+
+# Function run in a worker process: summarise one byte range of the file
+def summarize_range(file_path, start, end, kinds, dtypes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    summaries = summaries_for(kinds)
+    try:
+        with io.BufferedReader(RangeReader(file_path, start, end)) as reader:
+            for chunk in pd.read_csv(reader, header=None, names=list(kinds), dtype=dtypes, chunksize=chunk_size):
+                update_summaries(summaries, chunk)
+    except (ValueError, OverflowError):
+        if dtypes is None:
+            raise
+        # Rows beyond the schema sample did not fit the inferred dtypes
+        return summarize_range(file_path, start, end, kinds, None, chunk_size)
+    return summaries
+
+
+# Function to summarise a CSV across a process pool and merge the per-range summaries
+def parallel_summarize_csv(file_path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, preview_rows=5):
+    workers = workers or os.cpu_count() or 1
+    schema = get_schema(file_path)
+    sample = pd.read_csv(file_path, nrows=SAMPLE_ROWS, **read_options(schema))
+    kinds = column_kinds(sample)
+    ranges = byte_ranges(file_path, workers, schema["header"])
+    summaries = summaries_for(kinds)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(summarize_range, file_path, start, end, kinds, schema["dtypes"], chunk_size)
+            for start, end in ranges
+        ]
+        for future in futures:
+            merge_summaries(summaries, future.result())
+    return summaries, sample.head(preview_rows)
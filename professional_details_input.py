@@ -1,46 +1,31 @@
 import gradio as gr
-import pandas as pd  # For reading the CSV file
-import re  # For date validation
-
-# Load location data from CSV
-def load_location_data(csv_file):
-    """Load location data from a CSV file and return as a dictionary."""
-    df = pd.read_csv(csv_file)
-    location_data = {}
-    for state, city in zip(df["State"], df["City"]):
-        if state not in location_data:
-            location_data[state] = []
-        location_data[state].append(city)
-    return location_data
-
-# Load the CSV file into location_data
-location_data = load_location_data("Indian_Cities_Database_Kaggle.csv")
-print(location_data)
-
-# Function to validate date formats
-def validate_date(date):
-    if not date:
-        return True  # Allow empty end date for "in progress"
-    pattern = r"^(0[1-9]|1[0-2])/(0[1-9]|[12][0-9]|3[01])/\d{4}$|^(0[1-9]|1[0-2])/\d{4}$"
-    return bool(re.match(pattern, date))
+import logging
+
+from form_logging import get_logger, log_event
+from form_validation import professional_details_validator, project_validator
+from project_dates import ProjectTimeline, experience_months, parse_date, project_months
+from location_geo import get_city_grid
+from location_search import get_location_search
+from locations import get_locations
+
+locations = get_locations()
+location_search = get_location_search()
+city_grid = get_city_grid()
+logger = get_logger("professional_details")
 
 # Function to collect details
 def collect_details(name, email, mobile, country, state, city, photo, projects):
-    # Validate required fields
-    if not name or not email or not mobile or not country or not state or not city:
-        return "Error: All fields (Name, Email, Mobile, Country, State, City) are required."
-
-    if photo and not photo.lower().endswith(('.png', '.jpg', '.jpeg')):
-        return "Error: Please upload a valid image file (PNG, JPG, JPEG)."
-
-    # Validate projects
-    for project in projects:
-        if not project["project_name"] or not project["project_description"] or not project["tools_used"] or not project["roles"]:
-            return "Error: All project-related fields (Project Name, Description, Tools Used, Roles) are required."
-        if not validate_date(project["start_date"]):
-            return f"Error: Invalid Start Date format for project '{project['project_name']}'. Use MM/DD/YYYY or MM/YYYY."
-        if not validate_date(project["end_date"]):
-            return f"Error: Invalid End Date format for project '{project['project_name']}'. Use MM/DD/YYYY or MM/YYYY."
+    # Validate every field and project at once, so all problems are reported together
+    errors = professional_details_validator.validate({
+        "name": name, "email": email, "mobile": mobile,
+        "country": country, "state": state, "city": city, "photo": photo,
+    })
+    for number, project in enumerate(projects, start=1):
+        title = project["project_name"] or f"#{number}"
+        errors += [f"Project '{title}': {error}" for error in project_validator.validate(project)]
+    if errors:
+        log_event(logger, logging.INFO, "validation_failed", count=len(errors))
+        return "Error:\n" + "\n".join(f"- {error}" for error in errors)
 
     # Format the collected details
     details = f"""
@@ -56,8 +41,26 @@ def collect_details(name, email, mobile, country, state, city, photo, projects):
     else:
         details += "**No Photo Uploaded**\n\n"
 
+    # Month numbers parsed when each project was added; projects without valid dates are left out
+    dated = [project for project in projects if project.get("start_month") is not None]
+    undated = [project for project in projects if project.get("start_month") is None]
+    if dated:
+        starts = [project["start_month"] for project in dated]
+        ends = [project["end_month"] for project in dated]
+        total = experience_months(starts, ends)
+        details += f"**Total Experience**: {total // 12} years {total % 12} months\n\n"
+        for project, months in zip(dated, project_months(starts, ends)):
+            project["duration_months"] = int(months)
+        # Projects are listed by start month, each with the projects running at the same time
+        timeline = ProjectTimeline(starts, ends)
+        for position, first_month, last_month in zip(timeline.order, timeline.starts, timeline.ends):
+            dated[position]["concurrent"] = [
+                dated[other]["project_name"] for other in timeline.overlapping(first_month, last_month) if other != position
+            ]
+        dated = [dated[position] for position in timeline.order]
+
     details += "**Projects**:\n"
-    for project in projects:
+    for project in dated + undated:
         details += f"""
         - **Project Name**: {project['project_name']}
         - **Description**: {project['project_description']}
@@ -65,24 +68,58 @@ def collect_details(name, email, mobile, country, state, city, photo, projects):
         - **Roles**: {project['roles']}
         - **Start Date**: {project['start_date']}
         - **End Date**: {project['end_date'] or 'In Progress'}
+        - **Duration**: {project.get('duration_months', '?')} months
+        - **Concurrent With**: {', '.join(project.get('concurrent', [])) or 'None'}
         """
     return details
 
 def update_states(country):
     """Update the states dropdown based on the selected country."""
-    if country == "India":  # Assuming the country is India
-        return list(location_data.keys())  # Return only the list of states
-    return []  # Return an empty list if the country is invalid
+    states = locations.states(country)
+    log_event(logger, logging.DEBUG, "states_updated", country=country, count=len(states))
+    return gr.update(choices=states, value=None)  # No choices if the country is unknown
 
 def update_cities(country, state):
     """Update the cities dropdown based on the selected country and state."""
     if isinstance(state, list):
         state = state[0]  # Handle cases where state is passed as a list
-    if country == "India" and state in location_data:
-        cities = location_data[state]
-        print(f"Cities for {state}: {cities}")  # Debugging
-        return cities  # Return the list of cities for the selected state
-    return []  # Return an empty list if the state is invalid
+    if locations.has_state(country, state):
+        cities = locations.cities(country, state)
+        log_event(logger, logging.DEBUG, "cities_updated", country=country, state=state, count=len(cities))
+        return gr.update(choices=cities, value=None)  # Offer the cities of the selected state
+    log_event(logger, logging.INFO, "unknown_state", country=country, state=state)
+    return gr.update(choices=[], value=None)  # No choices if the state is invalid
+
+def search_locations(query):
+    """List the states and cities matching the text typed so far."""
+    return gr.update(choices=location_search.labels(query), value=None)
+
+def pick_location(label):
+    """Fill the country, state and city dropdowns from a picked search match."""
+    match = location_search.resolve(label) if label else None
+    if match is None:
+        return gr.update(), gr.update(), gr.update()
+    return (
+        gr.update(value=match["country"]),
+        gr.update(choices=locations.states(match["country"]), value=match["state"]),
+        gr.update(choices=locations.cities(match["country"], match["state"]), value=match["city"]),
+    )
+
+def nearest_location(coordinates):
+    """Fill the country, state and city dropdowns with the city nearest to "latitude, longitude"."""
+    try:
+        latitude, longitude = (float(part) for part in coordinates.split(","))
+    except (AttributeError, ValueError):
+        return gr.update(), gr.update(), gr.update()
+    nearest = city_grid.nearest_cities(latitude, longitude, 1)
+    if not nearest:
+        return gr.update(), gr.update(), gr.update()
+    country, state, city, _ = nearest[0]
+    return (
+        gr.update(value=country),
+        gr.update(choices=locations.states(country), value=state),
+        gr.update(choices=locations.cities(country, state), value=city),
+    )
 
 # Define the Gradio interface with custom CSS for background color
 with gr.Blocks(title="Professional IT Resume Builder", css=".interface { background-color: #f0f8ff; }") as interface:
@@ -95,39 +132,59 @@ with gr.Blocks(title="Professional IT Resume Builder", css=".interface { backgro
         email = gr.Textbox(label="Email", placeholder="Enter your email address")
         mobile = gr.Textbox(label="Mobile Number", placeholder="Enter your mobile number")
     
+    with gr.Row():
+        # Location search: typing lists matching states and cities, picking one fills the dropdowns
+        location_query = gr.Textbox(label="Find Location", placeholder="Type a city or state")
+        location_matches = gr.Dropdown(label="Matches", choices=[], interactive=True)
+        coordinates = gr.Textbox(label="Coordinates", placeholder="Latitude, Longitude")
+        nearest_button = gr.Button("Use Nearest City")
+
     with gr.Row():
         # Country dropdown
         country = gr.Dropdown(
             label="Country",
-            choices=["India"],  # Only India is supported
+            choices=locations.countries(),
             value="India",  # Default value
             interactive=True
         )
         # State dropdown
         state = gr.Dropdown(
             label="State",
-            choices=list(location_data.keys()),  # Populate with all states
-            value="TamilNadu",  # Default value
+            choices=locations.states("India"),  # Populate with the states of the default country
+            value="Tamil Nadu",  # Default value
             interactive=True
         )
         # City dropdown
         city = gr.Dropdown(
             label="City",
-            choices=location_data.get("TamilNadu", []),  # Populate with cities for TamilNadu
+            choices=locations.cities("India", "Tamil Nadu"),  # Populate with cities for Tamil Nadu
             value="Chennai",  # Default value
             interactive=True
         )
     
-    # Link dropdown updates
-    country.change(update_states, inputs=country, outputs=state)
-    state.change(update_cities, inputs=[country, state], outputs=city)
+    # Link dropdown updates; only user edits cascade, so a picked search match is not reset
+    country.input(update_states, inputs=country, outputs=state)
+    state.input(update_cities, inputs=[country, state], outputs=city)
+    location_query.input(search_locations, inputs=location_query, outputs=location_matches)
+    location_matches.input(pick_location, inputs=location_matches, outputs=[country, state, city])
+    nearest_button.click(nearest_location, inputs=coordinates, outputs=[country, state, city])
 
     photo = gr.Image(label="Upload Photo", type="filepath")
 
     # Dynamic project addition
     projects = gr.State([])  # To store multiple projects
 
+    # Function to parse a date typed into the form; None when it is empty or invalid
+    def parsed_date(text):
+        try:
+            return parse_date(text)
+        except ValueError:
+            return None, None
+
     def add_project(projects, project_name, project_description, tools_used, roles, start_date, end_date):
+        # Dates are normalised to month and day numbers once, when the project is added
+        start_month, start_day = parsed_date(start_date)
+        end_month, end_day = parsed_date(end_date)
         projects.append({
             "project_name": project_name,
             "project_description": project_description,
@@ -135,6 +192,10 @@ with gr.Blocks(title="Professional IT Resume Builder", css=".interface { backgro
             "roles": roles,
             "start_date": start_date,
             "end_date": end_date,
+            "start_month": start_month,
+            "start_day": start_day,
+            "end_month": end_month,
+            "end_day": end_day,
         })
         return projects, gr.update(value=""), gr.update(value=""), gr.update(value=""), gr.update(value=""), gr.update(value=""), gr.update(value="")
 
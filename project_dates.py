@@ -0,0 +1,113 @@
+import datetime
+import re
+
+import numpy as np
+import pandas as pd
+
+# MM/DD/YYYY or MM/YYYY
+DATE_PATTERN = re.compile(r"(?P<month>0[1-9]|1[0-2])/(?:(?P<day>0[1-9]|[12][0-9]|3[01])/)?(?P<year>\d{4})")
+
+# Day value of a MM/YYYY date, which has no day
+NO_DAY = np.iinfo(np.int32).min
+
+EPOCH = datetime.date(1970, 1, 1)
+
+
+# Function to turn a year and month into one integer that sorts and subtracts like a month count
+def month_number(year, month):
+    return year * 12 + month - 1
+
+
+# Function to parse a MM/DD/YYYY or MM/YYYY date into (month number, days since 1970-01-01).
+# The day is None for MM/YYYY dates; impossible dates such as 02/31/2024 raise ValueError.
+def parse_date(text):
+    match = DATE_PATTERN.fullmatch(str(text).strip())
+    if not match:
+        raise ValueError(f"Not a MM/DD/YYYY or MM/YYYY date: {text!r}")
+    year, month = int(match.group("year")), int(match.group("month"))
+    if match.group("day") is None:
+        return month_number(year, month), None
+    day = datetime.date(year, month, int(match.group("day")))  # Raises ValueError for impossible days
+    return month_number(year, month), (day - EPOCH).days
+
+
+# Function to parse a whole column of dates at once.
+# Returns (month numbers, day numbers, valid): day numbers are NO_DAY for MM/YYYY dates,
+# and rows that are empty, malformed or impossible have valid False and zeros elsewhere.
+def parse_dates(values):
+    parts = pd.Series(values, dtype=object).fillna("").astype(str).str.strip().str.extract(
+        f"^(?:{DATE_PATTERN.pattern})$"
+    )
+    valid = parts["month"].notna().to_numpy().copy()
+    years = pd.to_numeric(parts["year"], errors="coerce").fillna(1970).to_numpy(dtype=np.int64)
+    months = pd.to_numeric(parts["month"], errors="coerce").fillna(1).to_numpy(dtype=np.int64)
+    days = pd.to_numeric(parts["day"], errors="coerce")
+    has_day = days.notna().to_numpy()
+    days = days.fillna(1).to_numpy(dtype=np.int64)
+
+    month_starts = ((years - 1970) * 12 + months - 1).astype("datetime64[M]")
+    days_in_month = ((month_starts + 1).astype("datetime64[D]") - month_starts.astype("datetime64[D]")).astype(np.int64)
+    valid &= (days <= days_in_month) & (years >= 1)
+
+    month_numbers = np.where(valid, month_number(years, months), 0).astype(np.int32)
+    day_numbers = month_starts.astype("datetime64[D]").astype(np.int64) + days - 1
+    day_numbers = np.where(valid & has_day, day_numbers, np.where(valid, NO_DAY, 0)).astype(np.int32)
+    return month_numbers, day_numbers, valid
+
+
+# Function to return the current month number
+def current_month():
+    today = datetime.date.today()
+    return month_number(today.year, today.month)
+
+
+# Function to return each project's length in whole months, counting both the first and last month.
+# Projects still in progress (end None or negative) run to the given month, by default the current one.
+def project_months(start_months, end_months, today=None):
+    today = current_month() if today is None else today
+    starts = np.asarray(start_months, dtype=np.int64)
+    ends = np.array([today if end is None else end for end in end_months], dtype=np.int64)
+    ends = np.where(ends < 0, today, ends)
+    return np.maximum(ends - starts + 1, 0)
+
+
+# Function to return the months of experience covered by a set of projects, counting overlaps once
+def experience_months(start_months, end_months, today=None):
+    starts = np.asarray(start_months, dtype=np.int64)
+    if not len(starts):
+        return 0
+    ends = starts + project_months(starts, end_months, today) - 1
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    # A project adds only the months past the latest end of the projects before it
+    reach = np.maximum.accumulate(ends)
+    previous = np.concatenate([[starts[0] - 1], reach[:-1]])
+    return int(np.maximum(ends - np.maximum(starts - 1, previous), 0).sum())
+
+
+class ProjectTimeline:
+    """Projects sorted by start month, for range queries over who worked when.
+
+    ``overlapping`` finds the last project starting before the end of the
+    range with a binary search and checks the end months of only those
+    projects; a running maximum of the end months skips the leading projects
+    that all finished before the range starts.
+    """
+
+    def __init__(self, start_months, end_months, today=None):
+        starts = np.asarray(start_months, dtype=np.int64)
+        ends = starts + project_months(starts, end_months, today) - 1
+        self.order = np.argsort(starts, kind="stable")
+        self.starts = starts[self.order]
+        self.ends = ends[self.order]
+        self.reach = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+
+    # Function to return the positions (in input order) of projects active in any month of [first, last]
+    def overlapping(self, first_month, last_month):
+        stop = np.searchsorted(self.starts, last_month, side="right")
+        start = np.searchsorted(self.reach[:stop], first_month, side="left")
+        candidates = np.arange(start, stop)
+        return np.sort(self.order[candidates[self.ends[candidates] >= first_month]])
+
+    def active_in(self, month):
+        return self.overlapping(month, month)
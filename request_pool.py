@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Heavy analyses allowed to run at the same time; the rest wait in the queue
+DEFAULT_MAX_WORKERS = 4
+
+# Memory one request may use for the rows it holds at once
+DEFAULT_REQUEST_BUDGET_MB = 512
+
+# A parsed DataFrame chunk takes roughly this many times its CSV text size
+PARSED_SIZE_FACTOR = 4
+
+# Bytes read from the start of a file to estimate the size of a row
+ROW_SAMPLE_BYTES = 64 * 1024
+
+# Latencies kept for the metrics
+LATENCY_WINDOW = 1000
+
+
+# Function to estimate the average size of a CSV row in bytes from the start of the file
+def average_row_bytes(file_path):
+    with open(file_path, "rb") as handle:
+        sample = handle.read(ROW_SAMPLE_BYTES)
+    lines = sample.count(b"\n")
+    return len(sample) / lines if lines else max(len(sample), 1)
+
+
+# Function to shrink a chunk size until the rows held at once fit the memory budget
+def fit_chunk_size(file_path, chunk_size, budget_mb, workers=1):
+    row_bytes = average_row_bytes(file_path) * PARSED_SIZE_FACTOR * max(workers, 1)
+    max_rows = int(budget_mb * 1024 * 1024 // row_bytes)
+    if max_rows < 1:
+        raise MemoryError(f"A single row does not fit the {budget_mb} MB request budget")
+    return min(chunk_size, max_rows)
+
+
+class AnalysisPool:
+    """Bounded worker pool for blocking analyses, called from async request handlers.
+
+    Requests with the same key while one is already running share its result
+    instead of computing it again. ``stream`` runs a generator on the pool for
+    handlers that show partial results. Queue depth, running count and
+    latencies are tracked for the metrics display.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, request_budget_mb=DEFAULT_REQUEST_BUDGET_MB):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self.request_budget_mb = request_budget_mb
+        self.lock = threading.Lock()
+        self.in_flight = {}  # key -> concurrent future
+        self.waiters = {}  # concurrent future -> requests awaiting it
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.shared = 0
+        self.wait_times = deque(maxlen=LATENCY_WINDOW)
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def _run(self, submitted_at, function, args):
+        started_at = time.monotonic()
+        with self.lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_times.append(started_at - submitted_at)
+        try:
+            return function(*args)
+        finally:
+            with self.lock:
+                self.running -= 1
+                self.completed += 1
+                self.latencies.append(time.monotonic() - submitted_at)
+
+    def _forget(self, key, future):
+        with self.lock:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+
+    # Function to run function(*args) on the pool, or join the identical request already running.
+    # A cancelled request only cancels the job when no other request is waiting for it, and only
+    # while it is still queued; a running job finishes and its result is dropped.
+    async def run(self, key, function, *args):
+        with self.lock:
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.shared += 1
+            else:
+                self.queued += 1
+                future = self.executor.submit(self._run, time.monotonic(), function, args)
+                self.in_flight[key] = future
+                future.add_done_callback(lambda done: self._forget(key, done))
+            self.waiters[future] = self.waiters.get(future, 0) + 1
+        cancelled = False
+        try:
+            return await asyncio.shield(asyncio.wrap_future(future))
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            with self.lock:
+                self.waiters[future] -= 1
+                last = not self.waiters[future]
+                if last:
+                    del self.waiters[future]
+            # Outside the lock: cancelling runs the done callbacks, which take it
+            if cancelled and last and future.cancel():
+                with self.lock:
+                    self.queued -= 1  # Never reached _run, which would have counted it
+
+    # Function to iterate function(*args), a blocking generator, on the pool and yield its items
+    # to an async handler as they arrive. The generator holds one worker for its whole run and
+    # stops early if the handler stops listening; streams are never shared between requests.
+    async def stream(self, function, *args):
+        loop = asyncio.get_running_loop()
+        items = asyncio.Queue()
+        finished = object()
+        stopped = threading.Event()
+
+        def produce():
+            try:
+                for item in function(*args):
+                    if stopped.is_set():
+                        break
+                    loop.call_soon_threadsafe(items.put_nowait, item)
+            finally:
+                loop.call_soon_threadsafe(items.put_nowait, finished)
+
+        with self.lock:
+            self.queued += 1
+            future = self.executor.submit(self._run, time.monotonic(), produce, ())
+        try:
+            while (item := await items.get()) is not finished:
+                yield item
+            await asyncio.wrap_future(future)  # Re-raises an error from the generator
+        finally:
+            stopped.set()
+
+    def metrics(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            waits = sorted(self.wait_times)
+
+            def percentile(values, q):
+                return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+            return {
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "shared": self.shared,
+                "wait_p50": percentile(waits, 0.5),
+                "latency_p50": percentile(latencies, 0.5),
+                "latency_p95": percentile(latencies, 0.95),
+            }
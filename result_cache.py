@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from csv_schema import CACHE_DIR, evict_files, file_fingerprint, touch
+
+RESULT_CACHE_DIR = os.path.join(CACHE_DIR, "results")
+
+# Results kept in process memory before the least recently used one is dropped
+MAX_MEMORY_ENTRIES = 64
+
+# Result files are evicted, least recently used first, above this total size
+MAX_DISK_BYTES = 256 * 1024 ** 2
+
+
+# Function to build the cache key of a result from the file fingerprint and the options used
+def result_key(file_path, **options):
+    payload = json.dumps({"file": file_fingerprint(file_path), "options": options}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Two-level memo of JSON-serialisable results: an in-process LRU in front of files on disk."""
+
+    def __init__(self, cache_dir=RESULT_CACHE_DIR, max_entries=MAX_MEMORY_ENTRIES, max_bytes=MAX_DISK_BYTES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remember(self, key, value):
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    # Function to return a cached result, or None on a miss
+    def get(self, key):
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return self.memory[key]
+        try:
+            with open(self._disk_path(key), encoding="utf-8") as handle:
+                value = json.load(handle)
+        except (OSError, ValueError):
+            with self.lock:
+                self.misses += 1
+            return None
+        touch(self._disk_path(key))
+        with self.lock:
+            self.disk_hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        with self.lock:
+            self._remember(key, value)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{self._disk_path(key)}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(value, handle)
+        os.replace(temp_path, self._disk_path(key))
+        evict_files(self.cache_dir, ".json", self.max_bytes)
+
+    # Function to report hit counts and the hit rate
+    def metrics(self):
+        with self.lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self.memory),
+            }
@@ -0,0 +1,55 @@
+import math
+
+# Rows written per chunk when exporting the ranked results
+EXPORT_CHUNK_ROWS = 50_000
+
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/octet-stream"),
+    "Arrow": ("arrow", "application/vnd.apache.arrow.file"),
+}
+
+
+# Function to count the pages needed to show all rows
+def page_count(row_count, page_size):
+    return max(1, math.ceil(row_count / page_size))
+
+
+# Function to return only the rows of one page (pages start at 1)
+def page_of(results, page, page_size):
+    start = (page - 1) * page_size
+    return results.iloc[start:start + page_size]
+
+
+# Function to yield the results in fixed-size chunks
+def iter_chunks(results, chunk_rows=EXPORT_CHUNK_ROWS):
+    for start in range(0, len(results), chunk_rows):
+        yield results.iloc[start:start + chunk_rows]
+
+
+# Function to write the results to a file chunk by chunk in the given format
+def export_results(results, export_format, path, chunk_rows=EXPORT_CHUNK_ROWS):
+    if export_format == "CSV":
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            results.iloc[:0].to_csv(handle, index=False)
+            for chunk in iter_chunks(results, chunk_rows):
+                chunk.to_csv(handle, index=False, header=False)
+        return path
+
+    import pyarrow as pa
+
+    schema = pa.Schema.from_pandas(results.iloc[:0], preserve_index=False)
+    if export_format == "Parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(path, schema, compression="zstd")
+    elif export_format == "Arrow":
+        import pyarrow.ipc as ipc
+
+        writer = ipc.new_file(path, schema)
+    else:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    with writer:
+        for chunk in iter_chunks(results, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    return path
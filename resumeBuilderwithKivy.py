@@ -6,23 +6,67 @@ from kivy.uix.spinner import Spinner
 from kivy.uix.button import Button
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.popup import Popup
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.properties import ObjectProperty
+import logging
+
+from form_logging import get_logger, log_event
+from form_validation import resume_builder_validator
+from location_search import get_location_search
+from locations import get_locations
 
 # Constants for default dropdown values
 DEFAULT_COUNTRY = "Select Country"
 DEFAULT_STATE = "Select State"
 DEFAULT_CITY = "Select City"
+DEFAULT_MATCH = "Select Match"
+
+locations = get_locations()
+location_search = get_location_search()
+logger = get_logger("kivy_form")
+
+# One row of a LocationPicker's list; RecycleView reuses these for the visible rows only
+class LocationOption(Button):
+    picker = ObjectProperty(None, allownone=True)
+
+    def on_release(self):
+        self.picker.select(self.text)
+
+
+# Spinner-like button whose choices open in a RecycleView instead of one button per choice
+class LocationPicker(Button):
+    def __init__(self, placeholder, **kwargs):
+        super().__init__(text=placeholder, **kwargs)
+        self.placeholder = placeholder
+        self.values = ()  # A view into the shared location arrays
+        self.options = None  # Row data, built the first time the list is opened
+        self.popup = None
+
+    def set_values(self, values):
+        """Replace the choices; nothing is built until the list is opened."""
+        self.values = values
+        self.options = None
+        self.text = self.placeholder
+
+    def on_release(self):
+        if self.options is None:
+            self.options = [{"text": self.placeholder, "picker": self}]
+            self.options += [{"text": str(value), "picker": self} for value in self.values]
+        rows = RecycleBoxLayout(orientation="vertical", default_size=(None, 40), default_size_hint=(1, None), size_hint_y=None)
+        rows.bind(minimum_height=rows.setter("height"))
+        option_list = RecycleView(viewclass=LocationOption)
+        option_list.add_widget(rows)
+        option_list.data = self.options
+        self.popup = Popup(title=self.placeholder, content=option_list, size_hint=(0.8, 0.8))
+        self.popup.open()
+
+    def select(self, text):
+        self.text = text
+        if self.popup:
+            self.popup.dismiss()
+            self.popup = None
 
-# Sample location data for countries, states, and cities
-location_data = {
-    "India": {
-        "TamilNadu": ["Chennai", "Coimbatore", "Madurai"],
-        "Karnataka": ["Bangalore", "Mysore", "Hubli"],
-    },
-    "USA": {
-        "California": ["Los Angeles", "San Francisco", "San Diego"],
-        "Texas": ["Houston", "Austin", "Dallas"],
-    },
-}
 
 # Main layout for the Resume Builder
 class ResumeBuilder(BoxLayout):
@@ -68,11 +112,25 @@ class ResumeBuilder(BoxLayout):
         self.mobile_number_input = TextInput(hint_text="Enter your mobile number", size_hint_y=None, height=40)
         content.add_widget(self.mobile_number_input)
 
+        # Location Search
+        content.add_widget(Label(text="Find Location:", size_hint_y=None, height=30))
+        self.location_input = TextInput(hint_text="Type a city or state", size_hint_y=None, height=40, multiline=False)
+        self.location_input.bind(text=self.search_locations)
+        content.add_widget(self.location_input)
+        self.match_spinner = Spinner(
+            text=DEFAULT_MATCH,
+            values=[],
+            size_hint_y=None,
+            height=40,
+        )
+        self.match_spinner.bind(text=self.pick_location)
+        content.add_widget(self.match_spinner)
+
         # Country Code
         content.add_widget(Label(text="Country Code:", size_hint_y=None, height=30))
         self.country_spinner = Spinner(
             text=DEFAULT_COUNTRY,
-            values=[DEFAULT_COUNTRY] + list(location_data.keys()),
+            values=[DEFAULT_COUNTRY] + locations.countries(),
             size_hint_y=None,
             height=40,
         )
@@ -81,23 +139,13 @@ class ResumeBuilder(BoxLayout):
 
         # State
         content.add_widget(Label(text="State:", size_hint_y=None, height=30))
-        self.state_spinner = Spinner(
-            text=DEFAULT_STATE,
-            values=[],
-            size_hint_y=None,
-            height=40,
-        )
+        self.state_spinner = LocationPicker(DEFAULT_STATE, size_hint_y=None, height=40)
         self.state_spinner.bind(text=self.update_cities)
         content.add_widget(self.state_spinner)
 
         # City
         content.add_widget(Label(text="City:", size_hint_y=None, height=30))
-        self.city_spinner = Spinner(
-            text=DEFAULT_CITY,
-            values=[],
-            size_hint_y=None,
-            height=40,
-        )
+        self.city_spinner = LocationPicker(DEFAULT_CITY, size_hint_y=None, height=40)
         content.add_widget(self.city_spinner)
 
         # Submit Button
@@ -111,31 +159,44 @@ class ResumeBuilder(BoxLayout):
     def update_states(self, spinner, country):
         """Update the states dropdown based on the selected country."""
         try:
-            if country in location_data:
-                self.state_spinner.values = [DEFAULT_STATE] + list(location_data[country].keys())
-                self.state_spinner.text = DEFAULT_STATE
-                self.city_spinner.values = []  # Reset city dropdown
-                self.city_spinner.text = DEFAULT_CITY
+            if country in locations.countries():
+                states = locations.state_view(country)
+                self.state_spinner.set_values(states)
+                self.city_spinner.set_values(())  # Reset city dropdown
+                log_event(logger, logging.DEBUG, "states_updated", country=country, count=len(states))
             else:
-                self.state_spinner.values = []
-                self.state_spinner.text = DEFAULT_STATE
-                self.city_spinner.values = []
-                self.city_spinner.text = DEFAULT_CITY
-        except Exception as e:
-            print(f"Error updating states: {e}")
+                self.state_spinner.set_values(())
+                self.city_spinner.set_values(())
+        except Exception:
+            log_event(logger, logging.ERROR, "states_update_failed", exc_info=True, country=country)
 
     def update_cities(self, spinner, state):
         """Update the cities dropdown based on the selected state."""
         try:
             country = self.country_spinner.text
-            if country in location_data and state in location_data[country]:
-                self.city_spinner.values = [DEFAULT_CITY] + location_data[country][state]
-                self.city_spinner.text = DEFAULT_CITY
+            if locations.has_state(country, state):
+                cities = locations.city_view(country, state)
+                self.city_spinner.set_values(cities)
+                log_event(logger, logging.DEBUG, "cities_updated", country=country, state=state, count=len(cities))
             else:
-                self.city_spinner.values = []
-                self.city_spinner.text = DEFAULT_CITY
-        except Exception as e:
-            print(f"Error updating cities: {e}")
+                self.city_spinner.set_values(())
+        except Exception:
+            log_event(logger, logging.ERROR, "cities_update_failed", exc_info=True, state=state)
+
+    def search_locations(self, text_input, text):
+        """List the states and cities matching the text typed so far."""
+        self.match_spinner.values = location_search.labels(text)
+        self.match_spinner.text = DEFAULT_MATCH
+
+    def pick_location(self, spinner, label):
+        """Fill the country, state and city dropdowns from a picked search match."""
+        match = location_search.resolve(label)
+        if match is None:
+            return
+        self.country_spinner.text = match["country"]
+        self.state_spinner.text = match["state"]
+        if match["city"]:
+            self.city_spinner.text = match["city"]
 
     def submit_form(self, instance):
         """Handle form submission."""
@@ -149,14 +210,12 @@ class ResumeBuilder(BoxLayout):
             state = self.state_spinner.text
             city = self.city_spinner.text
 
-            # Validate required fields
-            if not first_name or not last_name or not employee_id or not mobile_number or country == DEFAULT_COUNTRY or state == DEFAULT_STATE or city == DEFAULT_CITY:
-                self.show_popup("Error", "All fields are required!")
-                return
-
-            # Validate mobile number
-            if not mobile_number.isdigit() or len(mobile_number) != 10:
-                self.show_popup("Error", "Invalid mobile number! Must be 10 digits.")
+            errors = resume_builder_validator.validate({
+                "first_name": first_name, "last_name": last_name, "employee_id": employee_id,
+                "mobile_number": mobile_number, "country": country, "state": state, "city": city,
+            })
+            if errors:
+                self.show_popup("Error", "\n".join(errors))
                 return
 
             # Display the collected data
@@ -170,8 +229,8 @@ class ResumeBuilder(BoxLayout):
             City: {city}
             """
             self.show_popup("Success", resume_details)
-        except Exception as e:
-            print(f"Error submitting form: {e}")
+        except Exception:
+            log_event(logger, logging.ERROR, "submit_failed", exc_info=True)
 
     def show_popup(self, title, message):
         """Display a popup with the given title and message."""
@@ -1,18 +1,46 @@
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QStringListModel, Qt
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QLabel, QLineEdit, QComboBox, QPushButton, QVBoxLayout, QWidget, QMessageBox
+    QApplication, QMainWindow, QLabel, QLineEdit, QComboBox, QPushButton, QVBoxLayout, QWidget, QMessageBox,
+    QCompleter
 )
 
-# Sample location data for countries, states, and cities
-location_data = {
-    "India": {
-        "TamilNadu": ["Chennai", "Coimbatore", "Madurai"],
-        "Karnataka": ["Bangalore", "Mysore", "Hubli"],
-    },
-    "USA": {
-        "California": ["Los Angeles", "San Francisco", "San Diego"],
-        "Texas": ["Houston", "Austin", "Dallas"],
-    },
-}
+import logging
+
+from form_logging import get_logger, log_event
+from form_validation import resume_builder_validator
+from location_search import get_location_search
+from locations import get_locations
+
+locations = get_locations()
+location_search = get_location_search()
+logger = get_logger("pyqt_form")
+
+
+class LocationListModel(QAbstractListModel):
+    """List model over a slice of the shared location arrays, after a fixed placeholder row.
+
+    Replacing the names only swaps the array view and resets the model; the
+    view asks for the text of the rows it actually shows.
+    """
+
+    def __init__(self, placeholder, names=(), parent=None):
+        super().__init__(parent)
+        self.placeholder = placeholder
+        self.names = names
+
+    def set_names(self, names):
+        self.beginResetModel()
+        self.names = names
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names) + 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        row = index.row()
+        return self.placeholder if row == 0 else str(self.names[row - 1])
 
 class ResumeBuilder(QMainWindow):
     def __init__(self):
@@ -49,24 +77,40 @@ class ResumeBuilder(QMainWindow):
         self.mobile_number_input = QLineEdit()
         layout.addWidget(self.mobile_number_input)
 
+        # Location search: typing shows matching states and cities, picking one fills the dropdowns
+        layout.addWidget(QLabel("Find Location:"))
+        self.location_input = QLineEdit()
+        self.location_input.setPlaceholderText("Type a city or state")
+        self.location_model = QStringListModel()
+        completer = QCompleter(self.location_model, self)
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)  # Keep the fuzzy matches
+        completer.activated[str].connect(self.pick_location)
+        self.location_input.setCompleter(completer)
+        self.location_input.textEdited.connect(self.search_locations)
+        layout.addWidget(self.location_input)
+
         # Country
         layout.addWidget(QLabel("Country:"))
         self.country_combo = QComboBox()
-        self.country_combo.addItems(["Select Country"] + list(location_data.keys()))
+        self.country_combo.addItems(["Select Country"] + locations.countries())
         self.country_combo.currentTextChanged.connect(self.update_states)
         layout.addWidget(self.country_combo)
 
         # State
         layout.addWidget(QLabel("State:"))
         self.state_combo = QComboBox()
-        self.state_combo.addItems(["Select State"])
+        self.state_model = LocationListModel("Select State", parent=self)
+        self.state_combo.setModel(self.state_model)
+        self.state_combo.view().setUniformItemSizes(True)  # Lay out only the visible rows
         self.state_combo.currentTextChanged.connect(self.update_cities)
         layout.addWidget(self.state_combo)
 
         # City
         layout.addWidget(QLabel("City:"))
         self.city_combo = QComboBox()
-        self.city_combo.addItems(["Select City"])
+        self.city_model = LocationListModel("Select City", parent=self)
+        self.city_combo.setModel(self.city_model)
+        self.city_combo.view().setUniformItemSizes(True)
         layout.addWidget(self.city_combo)
 
         # Submit Button
@@ -81,20 +125,34 @@ class ResumeBuilder(QMainWindow):
 
     def update_states(self, country):
         """Update the states dropdown based on the selected country."""
-        self.state_combo.clear()
-        self.city_combo.clear()
-        self.state_combo.addItem("Select State")
-        self.city_combo.addItem("Select City")
-        if country in location_data:
-            self.state_combo.addItems(location_data[country].keys())
+        states = locations.state_view(country)
+        self.state_model.set_names(states)
+        self.city_model.set_names(())
+        self.state_combo.setCurrentIndex(0)
+        self.city_combo.setCurrentIndex(0)
+        log_event(logger, logging.DEBUG, "states_updated", country=country, count=len(states))
 
     def update_cities(self, state):
         """Update the cities dropdown based on the selected state."""
         country = self.country_combo.currentText()
-        self.city_combo.clear()
-        self.city_combo.addItem("Select City")
-        if country in location_data and state in location_data[country]:
-            self.city_combo.addItems(location_data[country][state])
+        cities = locations.city_view(country, state)
+        self.city_model.set_names(cities)
+        self.city_combo.setCurrentIndex(0)
+        log_event(logger, logging.DEBUG, "cities_updated", country=country, state=state, count=len(cities))
+
+    def search_locations(self, text):
+        """Show the states and cities matching the text typed so far."""
+        self.location_model.setStringList(location_search.labels(text))
+
+    def pick_location(self, label):
+        """Fill the country, state and city dropdowns from a picked search match."""
+        match = location_search.resolve(label)
+        if match is None:
+            return
+        self.country_combo.setCurrentText(match["country"])
+        self.state_combo.setCurrentText(match["state"])
+        if match["city"]:
+            self.city_combo.setCurrentText(match["city"])
 
     def submit_form(self):
         """Handle form submission."""
@@ -107,14 +165,12 @@ class ResumeBuilder(QMainWindow):
         state = self.state_combo.currentText()
         city = self.city_combo.currentText()
 
-        # Validate required fields
-        if not first_name or not last_name or not employee_id or not mobile_number or country == "Select Country" or state == "Select State" or city == "Select City":
-            QMessageBox.warning(self, "Error", "All fields are required!")
-            return
-
-        # Validate mobile number
-        if not mobile_number.isdigit() or len(mobile_number) != 10:
-            QMessageBox.warning(self, "Error", "Invalid mobile number! Must be 10 digits.")
+        errors = resume_builder_validator.validate({
+            "first_name": first_name, "last_name": last_name, "employee_id": employee_id,
+            "mobile_number": mobile_number, "country": country, "state": state, "city": city,
+        })
+        if errors:
+            QMessageBox.warning(self, "Error", "\n".join(errors))
             return
 
         # Display the collected data
@@ -0,0 +1,157 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import pyarrow.compute as pc
+
+from location_geo import get_city_grid, haversine_km
+from location_search import normalize
+from locations import get_locations
+
+# Resumes give the candidate's location near the top, with the contact details
+LOCATION_SAMPLE_CHARS = 1500
+
+# Longest place name, in words, looked for in a resume
+MAX_NAME_WORDS = 3
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+# Words that mark a line as giving the candidate's location, e.g. "Location: Pune" or "Address: ..."
+LOCATION_CUES = re.compile(
+    r"\b(?:location|address|based in|based out of|lives in|living in|residing in|residence|hometown)\b", re.IGNORECASE
+)
+
+# Store columns holding a resume's normalised location
+LOCATION_COLUMNS = ("country", "state", "city", "latitude", "longitude", "location_cell")
+
+
+class PlaceNames:
+    """Normalised city, state and country names of the location index, for spotting them in free text."""
+
+    def __init__(self, index):
+        self.index = index
+        self.cities = {}  # name -> city positions, several when the name exists in more than one state
+        for position, city in enumerate(index.cities_array):
+            self.cities.setdefault(normalize(city), []).append(position)
+        self.states = {}  # name -> (country, state)
+        self.countries = {}  # name -> country
+        for country in index.countries():
+            self.countries[normalize(country)] = country
+            for state in index.states(country):
+                self.states.setdefault(normalize(state), (country, state))
+
+    # Function to return the place names in a text, longest first at each word, in reading order
+    def mentions(self, text):
+        words = WORD_PATTERN.findall(text.lower())
+        found = []
+        for start in range(len(words)):
+            for length in range(min(MAX_NAME_WORDS, len(words) - start), 0, -1):
+                name = " ".join(words[start:start + length])
+                if name in self.cities or name in self.states or name in self.countries:
+                    found.append(name)
+                    break
+        return found
+
+
+@lru_cache(maxsize=None)
+def get_place_names():
+    return PlaceNames(get_locations())
+
+
+# Function to return an empty location record
+def no_location():
+    return dict.fromkeys(LOCATION_COLUMNS)
+
+
+# Function to pick the city a name refers to on one line of a resume, as (position, (country, state, city)).
+# A bare city name is too often an ordinary word ("Mobile", "Nice") to count, so the line must also
+# name the city's state or country, or mark itself as a location line; None when it does neither.
+def resolve_city(places, positions, mentions, cue):
+    described = [get_city_grid().describe(position) for position in positions]
+    states = {places.states[name] for name in mentions if name in places.states}
+    countries = {places.countries[name] for name in mentions if name in places.countries}
+    for position, (country, state, city) in zip(positions, described):
+        if (country, state) in states:
+            return position, (country, state, city)
+    for position, (country, state, city) in zip(positions, described):
+        if country in countries or (cue and not countries):
+            return position, (country, state, city)
+    return None
+
+
+# Function to find a resume's location near the top: the first city confirmed by its line (see
+# resolve_city), or failing that the first state on a location line or next to its country.
+def detect_location(text, sample_chars=LOCATION_SAMPLE_CHARS):
+    places = get_place_names()
+    lines = [(places.mentions(line), LOCATION_CUES.search(line) is not None) for line in text[:sample_chars].splitlines()]
+    for mentions, cue in lines:
+        for name in mentions:
+            resolved = resolve_city(places, places.cities[name], mentions, cue) if name in places.cities else None
+            if resolved is None:
+                continue
+            position, (country, state, city) = resolved
+            grid = get_city_grid()
+            latitude = float(places.index.latitudes[position])
+            longitude = float(places.index.longitudes[position])
+            return {
+                "country": country,
+                "state": state,
+                "city": city,
+                "latitude": latitude,
+                "longitude": longitude,
+                "location_cell": int(grid.cell_ids(latitude, longitude)),
+            }
+    for mentions, cue in lines:
+        countries = {places.countries[name] for name in mentions if name in places.countries}
+        for name in mentions:
+            if name in places.states and (cue or places.states[name][0] in countries):
+                location = no_location()
+                location["country"], location["state"] = places.states[name]
+                return location
+    return no_location()
+
+
+class LocationFilter:
+    """Keep only resumes in a state, or within ``radius_km`` of a city.
+
+    For a radius the grid cells the circle can touch are worked out once, so
+    resumes are first pruned by an integer cell lookup (pushed into the store
+    scan as an Arrow filter) and exact haversine distances are only computed
+    for the few left.
+    """
+
+    def __init__(self, country, state, city=None, radius_km=None):
+        self.country = country
+        self.state = state
+        self.radius_km = radius_km if city else None
+        self.center = None
+        self.cells = None
+        if self.radius_km is not None:
+            self.center = get_locations().coordinates(country, state, city)
+            if self.center is None:
+                raise ValueError(f"Unknown city: {city}, {state}, {country}")
+            self.cells = get_city_grid().cells_within(*self.center, self.radius_km)
+
+    # Function to return the filter as an Arrow expression over the store's location columns.
+    # Records stored before locations were kept also pass, so their location can be detected.
+    def expression(self):
+        if self.cells is not None:
+            matches = pc.field("location_cell").isin(self.cells.tolist())
+        else:
+            matches = (pc.field("country") == self.country) & (pc.field("state") == self.state)
+        return matches | pc.field("country").is_null()
+
+    # Function to return a boolean mask over parallel lists of location records
+    def mask(self, locations):
+        if self.cells is None:
+            return np.array([loc["country"] == self.country and loc["state"] == self.state for loc in locations],
+                            dtype=bool)
+        cells = np.array([-1 if loc["location_cell"] is None else loc["location_cell"] for loc in locations],
+                         dtype=np.int64)
+        keep = np.isin(cells, self.cells)
+        candidates = np.flatnonzero(keep)
+        if len(candidates):
+            latitudes = np.array([locations[i]["latitude"] for i in candidates], dtype=np.float64)
+            longitudes = np.array([locations[i]["longitude"] for i in candidates], dtype=np.float64)
+            keep[candidates] = haversine_km(*self.center, latitudes, longitudes) <= self.radius_km
+        return keep
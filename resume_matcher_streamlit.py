@@ -1,3 +1,6 @@
+import hashlib
+import tempfile
+from functools import partial
 import streamlit as st
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -9,23 +12,68 @@ from sumy.parsers.plaintext import PlaintextParser
 from sumy.nlp.tokenizers import Tokenizer
 from sumy.summarizers.lsa import LsaSummarizer
 import pandas as pd
+from language_routing import LanguageShardedIndex, detect_language, stop_words_for
+from locations import get_locations
+from resume_location import LOCATION_COLUMNS, LocationFilter, detect_location
+from resume_store import ResumeStore, extract_skills
+from results_export import EXPORT_FORMATS, export_results, page_count, page_of
+
+# LSA summarizer that records every sentence's rating instead of picking the best ones
+class RankingLsaSummarizer(LsaSummarizer):
+    def _get_best_sentences(self, sentences, count, rating, *args, **kwargs):
+        self.ranking = [(rating(sentence), order, str(sentence)) for order, sentence in enumerate(sentences)]
+        return ()
+
+# Function to rank all sentences once; returns (order, sentence) pairs, best first
+def rank_sentences(text, language=None):
+    language = language or detect_language(text)
+    parser = PlaintextParser.from_string(text, Tokenizer(language))
+    summarizer = RankingLsaSummarizer()
+    summarizer.stop_words = stop_words_for(language)
+    summarizer.ranking = []
+    summarizer(parser.document, len(parser.document.sentences))
+    ranking = sorted(summarizer.ranking, key=lambda item: (-item[0], item[1]))
+    return [(order, sentence) for _, order, sentence in ranking]
+
+# Function to pick the top sentences from a ranking, in document order
+def summary_from_ranking(ranking, sentence_count=5):
+    return [sentence for _, sentence in sorted(ranking[:sentence_count])]
 
 # Function to summarize text using Sumy
-def summarize_text(text, sentence_count=5):
-    parser = PlaintextParser.from_string(text, Tokenizer("english"))
-    summarizer = LsaSummarizer()
-    summary = summarizer(parser.document, sentence_count)
-    return " ".join(str(sentence) for sentence in summary)
+def summarize_text(text, sentence_count=5, language=None):
+    return " ".join(summary_from_ranking(rank_sentences(text, language), sentence_count))
 
 # Function to calculate similarity between job description and resumes
-def calculate_similarity(job_description, resumes):
+def calculate_similarity(job_description, resumes, language="english"):
     documents = [job_description] + resumes
-    vectorizer = TfidfVectorizer(stop_words='english')
+    vectorizer = TfidfVectorizer(stop_words=list(stop_words_for(language)))
     tfidf_matrix = vectorizer.fit_transform(documents)
     similarity_scores = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).flatten()
     return similarity_scores
 
-# Function to extract text from different file formats
+# Function to rank the TF-IDF scores of a shard as (doc id, score) pairs: the top k, or every resume when k is None
+def rank_tfidf_scores(shard, similarity_scores, k=None):
+    scores = pd.Series(similarity_scores, index=shard, dtype=float)
+    ordered = scores.sort_values(ascending=False, kind="stable") if k is None else scores.nlargest(k)
+    return list(ordered.items())
+
+# Function to rank resumes with field-weighted BM25 over skills, experience and projects, searching
+# only the shard written in the job description's language. The top k come from MaxScore, which skips
+# resumes that cannot make the cut; only k None (e.g. for an export) scores every resume.
+def calculate_bm25_scores(job_description, index, k=None):
+    if k is None:
+        return index.rank(job_description)
+    return index.search(job_description, k=k)
+
+# Function to lay out ranked (doc id, score) pairs as the results table
+def results_table(matches, resume_names):
+    return pd.DataFrame({
+        "Rank": range(1, len(matches) + 1),
+        "Resume": [resume_names[doc_id] for doc_id, _ in matches],
+        "Similarity Score": [score for _, score in matches],
+    })
+
+# Function to extract text from different file formats; raises ValueError for other formats
 def extract_text_from_file(file):
     if file.name.endswith(".txt"):
         return file.read().decode("utf-8")
@@ -39,8 +87,93 @@ def extract_text_from_file(file):
         image = Image.open(file)
         return pytesseract.image_to_string(image)
     else:
-        st.error("Unsupported file format!")
+        raise ValueError(f"Unsupported file format: {file.name}")
+
+# Function to hash an uploaded file so its results can be cached across reruns
+def file_hash(file):
+    return hashlib.sha256(file.getvalue()).hexdigest()
+
+# Cached per file hash; the leading underscore keeps Streamlit from hashing the file object.
+# Returns (text, error message); the caller shows the error, as cached functions must not render.
+@st.cache_data(show_spinner=False)
+def extract_text_cached(resume_hash, _file):
+    try:
+        return extract_text_from_file(_file), None
+    except ValueError as error:
+        return None, str(error)
+
+# Cached per file hash so changing the summary length never re-runs the LSA decomposition
+@st.cache_data(show_spinner=False)
+def rank_sentences_cached(resume_hash, _text):
+    return rank_sentences(_text)
+
+# BM25F index of a pool of resumes, built once per pool and reused across reruns and queries.
+# Keyed by the resume hashes and languages; the leading underscore keeps Streamlit from hashing the texts
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_bm25_index(resume_hashes, languages, _resumes):
+    return LanguageShardedIndex(_resumes, list(languages))
+
+# One resume store per server process
+@st.cache_resource
+def get_resume_store():
+    return ResumeStore()
+
+# Function to extract resumes, reusing text, summaries and locations already in the resume store
+def load_resumes(files, resume_store):
+    hashes = [file_hash(file) for file in files]
+    stored = resume_store.lookup(hashes)
+    names, texts, summaries, languages, resume_locations, new_records = [], [], [], [], [], []
+    resume_hashes = []
+    for file, resume_hash in zip(files, hashes):
+        record = stored.get(resume_hash)
+        if record is None:
+            try:
+                text = extract_text_from_file(file)
+            except ValueError as error:
+                st.warning(str(error))
+                continue
+            if not text:
+                continue
+            language = detect_language(text)
+            record = {
+                "file_hash": resume_hash,
+                "file_name": file.name,
+                "text": text,
+                "language": language,
+                "summary": summarize_text(text, language=language),
+                "skills": extract_skills(text),
+                **detect_location(text),
+            }
+            stored[resume_hash] = record
+            new_records.append(record)
+        names.append(file.name)
+        resume_hashes.append(resume_hash)
+        texts.append(record["text"])
+        summaries.append(record["summary"])
+        languages.append(record["language"] or detect_language(record["text"]))
+        resume_locations.append(stored_location(record))
+    resume_store.append(new_records)
+    return names, texts, summaries, languages, resume_locations, resume_hashes
+
+# Function to return a stored record's location, detecting it for records stored before locations were kept
+def stored_location(record):
+    if record.get("country") is None:
+        return detect_location(record["text"])
+    return {column: record[column] for column in LOCATION_COLUMNS}
+
+# Function to build the HR portal's location filter from its widgets; None matches everywhere
+def location_filter_input():
+    mode = st.selectbox("Location filter", ["Anywhere", "In state", "Within a radius of a city"])
+    if mode == "Anywhere":
         return None
+    locations = get_locations()
+    country = st.selectbox("Country", locations.countries())
+    state = st.selectbox("State", locations.states(country))
+    if mode == "In state":
+        return LocationFilter(country, state)
+    city = st.selectbox("City", locations.cities(country, state))
+    radius_km = st.slider("Radius (km)", min_value=5, max_value=500, value=50, step=5)
+    return LocationFilter(country, state, city, radius_km)
 
 # Streamlit app
 st.title("Resume Matcher with Sumy and Streamlit")
@@ -51,31 +184,86 @@ role = st.sidebar.selectbox("Select your role", ["Candidate", "HR", "Admin"])
 if role == "Candidate":
     st.header("Candidate Portal")
     uploaded_file = st.file_uploader("Upload your resume (TXT, DOCX, PDF, or Image)", type=["txt", "docx", "pdf", "png", "jpg", "jpeg"])
+    sentence_count = st.slider("Summary length (sentences)", min_value=1, max_value=15, value=5)
     if uploaded_file:
-        resume_text = extract_text_from_file(uploaded_file)
+        resume_hash = file_hash(uploaded_file)
+        with st.spinner("Extracting text..."):
+            resume_text, error = extract_text_cached(resume_hash, uploaded_file)
+        if error:
+            st.error(error)
         if resume_text:
-            summarized_resume = summarize_text(resume_text)
             st.subheader("Summarized Resume")
-            st.write(summarized_resume)
+            with st.spinner("Ranking sentences..."):
+                ranking = rank_sentences_cached(resume_hash, resume_text)
+            st.write(" ".join(summary_from_ranking(ranking, sentence_count)))
 
 elif role == "HR":
     st.header("HR Portal")
     job_description = st.text_area("Enter Job Description")
     uploaded_files = st.file_uploader("Upload resumes (TXT, DOCX, PDF, or Image)", type=["txt", "docx", "pdf", "png", "jpg", "jpeg"], accept_multiple_files=True)
-    if job_description and uploaded_files:
-        resumes = []
-        for file in uploaded_files:
-            resume_text = extract_text_from_file(file)
-            if resume_text:
-                resumes.append(resume_text)
-        summarized_resumes = [summarize_text(resume) for resume in resumes]
-        similarity_scores = calculate_similarity(job_description, summarized_resumes)
-        results = pd.DataFrame({
-            "Resume": [file.name for file in uploaded_files],
-            "Similarity Score": similarity_scores
-        }).sort_values(by="Similarity Score", ascending=False)
+    scoring_method = st.selectbox("Scoring method", ["TF-IDF cosine", "BM25F (section weighted)"])
+    top_k = st.number_input("Top matches to show (0 = all)", min_value=0, value=50, step=1)
+    include_stored = st.checkbox("Also match against all previously stored resumes")
+    location_filter = location_filter_input()
+    if job_description and (uploaded_files or include_stored):
+        resume_store = get_resume_store()
+        resume_names, resumes, summarized_resumes, languages, resume_locations, resume_hashes = load_resumes(uploaded_files or [], resume_store)
+        if include_stored:
+            # Memory-mapped read of the store, skipping the resumes just uploaded; the location
+            # filter is pushed into the scan so resumes elsewhere are never read
+            stored = resume_store.load(
+                columns=["file_hash", "file_name", "text", "summary", "language", *LOCATION_COLUMNS],
+                filter=location_filter.expression() if location_filter else None,
+            ).to_pylist()
+            uploaded_hashes = {file_hash(file) for file in uploaded_files or []}
+            for record in stored:
+                if record["file_hash"] not in uploaded_hashes:
+                    uploaded_hashes.add(record["file_hash"])
+                    resume_names.append(record["file_name"])
+                    resume_hashes.append(record["file_hash"])
+                    resumes.append(record["text"])
+                    summarized_resumes.append(record["summary"])
+                    languages.append(record["language"] or detect_language(record["text"]))
+                    resume_locations.append(stored_location(record))
+        if location_filter:
+            # Prune the pool before any scoring; radius filters check cells first, then exact distances
+            keep = location_filter.mask(resume_locations).tolist()
+            resume_names, resumes, summarized_resumes, languages, resume_hashes = (
+                [value for value, kept in zip(values, keep) if kept]
+                for values in (resume_names, resumes, summarized_resumes, languages, resume_hashes)
+            )
+        if not resumes:
+            st.warning("No readable resumes to match.")
+            st.stop()
+        query_language = detect_language(job_description)
+        st.caption(f"Job description language: {query_language.title()}; only resumes in this language are matched.")
+        shard = [i for i, language in enumerate(languages) if language == query_language]
+        # rank(k) returns the top k matches, or all of them for k None
+        if scoring_method == "TF-IDF cosine":
+            similarity_scores = calculate_similarity(job_description, [summarized_resumes[i] for i in shard], query_language) if shard else []
+            rank = partial(rank_tfidf_scores, shard, similarity_scores)
+        else:
+            # BM25F needs the section headings, so it scores the full resume text
+            index = get_bm25_index(tuple(resume_hashes), tuple(languages), resumes)
+            rank = partial(calculate_bm25_scores, job_description, index)
+        results = results_table(rank(int(top_k) or None), resume_names)
         st.subheader("Matching Results")
-        st.dataframe(results)
+        page_size = st.selectbox("Rows per page", [25, 50, 100, 500], index=1)
+        total_pages = page_count(len(results), page_size)
+        page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, step=1)
+        st.caption(f"Page {page} of {total_pages} ({len(results)} top matches of {len(shard)} resumes)")
+        # Only the visible page is serialised and sent to the browser
+        st.dataframe(page_of(results, int(page), page_size), hide_index=True)
+
+        export_format = st.selectbox("Export format", list(EXPORT_FORMATS))
+        if st.button("Prepare export"):
+            extension, mime = EXPORT_FORMATS[export_format]
+            # The export holds the full ranking, only computed when asked for. It is written to disk
+            # in chunks and handed to the button as an open file, which is removed once that returns.
+            with tempfile.NamedTemporaryFile(suffix=f".{extension}") as export_file:
+                export_results(results_table(rank(None), resume_names), export_format, export_file.name)
+                with open(export_file.name, "rb") as export_data:
+                    st.download_button("Download results", export_data, file_name=f"matching_results.{extension}", mime=mime)
 
 elif role == "Admin":
     st.header("Admin Portal")
@@ -0,0 +1,208 @@
+import json
+import os
+import re
+import threading
+import time
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs
+import pyarrow.parquet as pq
+
+from bm25_scorer import split_sections
+
+# Default location of the resume store, next to this script
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_store")
+
+# Lists the live segments of a store
+MANIFEST_NAME = "manifest.json"
+
+# Number of appended segments that triggers a compaction
+COMPACT_AFTER_SEGMENTS = 32
+
+SCHEMA = pa.schema([
+    ("file_hash", pa.string()),
+    ("file_name", pa.string()),
+    ("text", pa.large_string()),
+    ("language", pa.string()),
+    ("summary", pa.string()),
+    ("skills", pa.list_(pa.string())),
+    ("char_count", pa.int64()),
+    ("stored_at", pa.int64()),
+    # Normalised location; location_cell is the city grid cell, for pruning radius searches
+    ("country", pa.string()),
+    ("state", pa.string()),
+    ("city", pa.string()),
+    ("latitude", pa.float64()),
+    ("longitude", pa.float64()),
+    ("location_cell", pa.int64()),
+])
+
+
+# Function to pull a skills list out of the skills section of a resume
+def extract_skills(text):
+    skills_text = split_sections(text).get("skills", "")
+    skills = []
+    for item in re.split(r"[,;\n|•]", skills_text):
+        item = item.strip(" -*\t")
+        if item and item.lower() not in (skill.lower() for skill in skills):
+            skills.append(item)
+    return skills
+
+
+# Function to key each row by the write that stored it, i.e. its file hash and stored_at
+def write_keys(table):
+    return pc.binary_join_element_wise(table["file_hash"], pc.cast(table["stored_at"], pa.string()), "@")
+
+
+class ResumeStore:
+    """Append-only columnar store of extracted resumes.
+
+    Every ``append`` writes a new zstd-compressed Parquet segment; once there
+    are too many segments they are compacted into one. The live segments are
+    listed in a manifest that is replaced atomically, so a reader always sees
+    a complete set; segments replaced by a compaction are only removed once
+    no read of an older manifest is still running. Reads memory-map the
+    segments and return the newest record for each file hash; columns added
+    to the schema later read as null from older segments.
+    """
+
+    def __init__(self, directory=DEFAULT_STORE_DIR, compact_after=COMPACT_AFTER_SEGMENTS):
+        self.directory = directory
+        self.compact_after = compact_after
+        self.filesystem = pyarrow.fs.LocalFileSystem(use_mmap=True)
+        # write_lock serialises appends and compactions; lock guards the manifest and reader counts
+        self.write_lock = threading.Lock()
+        self.lock = threading.Lock()
+        self.readers = {}
+        self.retired = []
+        os.makedirs(directory, exist_ok=True)
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        on_disk = sorted(name for name in os.listdir(directory) if name.endswith(".parquet"))
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as handle:
+                manifest = json.load(handle)
+            self.generation, self.live = manifest["generation"], manifest["segments"]
+            # Segments outside the manifest were left by an interrupted append or compaction
+            for name in set(on_disk) - set(self.live):
+                os.remove(os.path.join(directory, name))
+        else:
+            # Stores written before the manifest existed list every segment
+            self.generation, self.live = 0, on_disk
+            self._write_manifest()
+
+    def segments(self):
+        return [os.path.join(self.directory, name) for name in self.live]
+
+    def _new_segment_path(self):
+        return os.path.join(self.directory, f"part-{time.time_ns():020d}.parquet")
+
+    def _write_manifest(self):
+        temp_path = f"{self.manifest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump({"generation": self.generation, "segments": self.live}, handle)
+        os.replace(temp_path, self.manifest_path)
+
+    # Function to publish a new list of live segments; the replaced ones wait for older reads to finish
+    def _publish(self, live, replaced=()):
+        with self.lock:
+            self.generation += 1
+            self.live = live
+            self._write_manifest()
+            if replaced:
+                self.retired.append((self.generation, list(replaced)))
+            self._remove_retired()
+
+    # Function to delete retired segments no running read can still open; call with the lock held
+    def _remove_retired(self):
+        oldest_read = min(self.readers, default=self.generation)
+        waiting = []
+        for generation, paths in self.retired:
+            if oldest_read < generation:
+                waiting.append((generation, paths))
+                continue
+            for path in paths:
+                os.remove(path)
+        self.retired = waiting
+
+    # Function to add records (dicts keyed by the schema columns) as a new segment
+    def append(self, records):
+        if not records:
+            return
+        stored_at = time.time_ns()
+        rows = [
+            {
+                "file_hash": record["file_hash"],
+                "file_name": record.get("file_name"),
+                "text": record["text"],
+                "language": record.get("language"),
+                "summary": record.get("summary"),
+                "skills": record.get("skills") or [],
+                "char_count": len(record["text"]),
+                "stored_at": stored_at,
+                "country": record.get("country"),
+                "state": record.get("state"),
+                "city": record.get("city"),
+                "latitude": record.get("latitude"),
+                "longitude": record.get("longitude"),
+                "location_cell": record.get("location_cell"),
+            }
+            for record in records
+        ]
+        table = pa.Table.from_pylist(rows, schema=SCHEMA)
+        with self.write_lock:
+            path = self._new_segment_path()
+            pq.write_table(table, path, compression="zstd")
+            self._publish(self.live + [os.path.basename(path)])
+            if len(self.live) >= self.compact_after:
+                self._compact()
+
+    # Function to load the newest record of each file hash as a memory-mapped Arrow table
+    def load(self, columns=None, filter=None):
+        with self.lock:
+            generation, segments = self.generation, self.segments()
+            self.readers[generation] = self.readers.get(generation, 0) + 1
+        try:
+            return self._read(segments, columns, filter)
+        finally:
+            with self.lock:
+                self.readers[generation] -= 1
+                if not self.readers[generation]:
+                    del self.readers[generation]
+                self._remove_retired()
+
+    def _read(self, segments, columns=None, filter=None):
+        columns = columns or SCHEMA.names
+        if not segments:
+            return SCHEMA.empty_table().select(columns)
+        dataset = ds.dataset(segments, schema=SCHEMA, format="parquet", filesystem=self.filesystem)
+        # The newest write of a hash wins, even when only an older one matches the filter
+        latest = (
+            dataset.to_table(columns=["file_hash", "stored_at"])
+            .group_by("file_hash")
+            .aggregate([("stored_at", "max")])
+            .rename_columns(["file_hash", "stored_at"])
+        )
+        extra = [name for name in ("file_hash", "stored_at") if name not in columns]
+        table = dataset.to_table(columns=list(columns) + extra, filter=filter)
+        table = table.filter(pc.is_in(write_keys(table), value_set=write_keys(latest)))
+        return table.sort_by("stored_at").select(columns)
+
+    # Function to fetch the newest record for each of the given file hashes
+    def lookup(self, file_hashes):
+        table = self.load(filter=pc.field("file_hash").isin(list(file_hashes)))
+        return {record["file_hash"]: record for record in table.to_pylist()}
+
+    # Function to merge all segments into one, dropping superseded records
+    def compact(self):
+        with self.write_lock:
+            self._compact()
+
+    def _compact(self):
+        segments = self.segments()
+        if len(segments) < 2:
+            return
+        path = self._new_segment_path()
+        pq.write_table(self._read(segments), path, compression="zstd")
+        self._publish([os.path.basename(path)], replaced=segments)
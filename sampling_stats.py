@@ -0,0 +1,176 @@
+import io
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from csv_schema import get_schema, iter_csv, load_csv, read_options
+
+# Rows kept in the reservoir sample
+DEFAULT_SAMPLE_SIZE = 10_000
+
+# Small chunks so the first estimate arrives quickly
+SAMPLING_CHUNK_SIZE = 50_000
+
+# Normal quantile for 95% confidence intervals
+Z_95 = 1.96
+
+# Rows read from random offsets for the first, whole-file estimate
+QUICK_SAMPLE_ROWS = 2_000
+
+# Files with at most this many bytes of data are read whole instead of sampled
+QUICK_WHOLE_FILE_BYTES = 1024 * 1024
+
+# Minimum seconds between progress updates during the full pass
+REFRESH_SECONDS = 1.0
+
+
+# Function to read only the first rows of a file
+def quick_preview(file_path, rows=5):
+    return load_csv(file_path, nrows=rows)
+
+
+# Function to read distinct whole lines at random byte offsets across the file.
+# Returns (sample, data rows, complete): small files are read whole, with complete True and the
+# exact row count; otherwise the row count is estimated. Rows after long lines are slightly
+# favoured, and quoted fields containing line breaks are not supported.
+def random_line_sample(file_path, rows=QUICK_SAMPLE_ROWS, seed=None):
+    schema = get_schema(file_path)
+    rng = np.random.default_rng(seed)
+    size = os.path.getsize(file_path)
+    lines = {}  # line start -> line, so a line hit by two offsets is sampled once
+    with open(file_path, "rb") as handle:
+        if schema["header"]:
+            handle.readline()
+        data_start = handle.tell()
+        if size <= data_start:
+            return pd.DataFrame(columns=schema["columns"]), 0, True
+        if size - data_start <= QUICK_WHOLE_FILE_BYTES:
+            sample = load_csv(file_path)
+            return sample, len(sample), True
+        offsets = rng.choice(size - data_start, min(rows, size - data_start), replace=False) + data_start
+        for offset in np.sort(offsets):
+            handle.seek(max(offset - 1, data_start))
+            if offset > data_start:
+                handle.readline()  # Finish the line the offset landed in
+            start = handle.tell()
+            line = handle.readline()
+            if line.strip():
+                lines[start] = line if line.endswith(b"\n") else line + b"\n"
+    if not lines:
+        return pd.DataFrame(columns=schema["columns"]), 0, False
+    estimated_rows = round((size - data_start) / np.mean([len(line) for line in lines.values()]))
+    text = b"".join(lines.values())
+    try:
+        sample = pd.read_csv(io.BytesIO(text), **{**read_options(schema), "header": None})
+    except (ValueError, OverflowError):
+        sample = pd.read_csv(io.BytesIO(text), **{**read_options(schema, typed=False), "header": None})
+    return sample, max(estimated_rows, len(sample)), False
+
+
+class ReservoirSample:
+    """Uniform random sample of fixed size over a stream of chunks (Algorithm R, vectorised per chunk)."""
+
+    def __init__(self, size=DEFAULT_SAMPLE_SIZE, seed=None):
+        self.size = size
+        self.seen = 0
+        self.rows = None
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, chunk):
+        chunk = chunk.reset_index(drop=True)
+        if self.rows is None:
+            self.rows = chunk.iloc[:0]
+        # Chunks can disagree on dtypes: categoricals get each chunk's own categories, and untyped
+        # chunks after a schema fallback hold floats or text. Both sides take the common dtype.
+        if not self.rows.dtypes.equals(chunk.dtypes):
+            dtypes = pd.concat([self.rows.iloc[:0], chunk.iloc[:0]]).dtypes
+            self.rows, chunk = self.rows.astype(dtypes), chunk.astype(dtypes)
+        # Fill the reservoir first
+        room = self.size - len(self.rows)
+        if room > 0:
+            self.rows = pd.concat([self.rows, chunk.iloc[:room]], ignore_index=True)
+            self.seen += min(room, len(chunk))
+            chunk = chunk.iloc[room:]
+        if not len(chunk):
+            return
+        # Row number i (0-based) replaces a random slot with probability size / (i + 1)
+        positions = np.arange(self.seen, self.seen + len(chunk))
+        slots = (self.rng.random(len(chunk)) * (positions + 1)).astype(np.int64)
+        chosen = np.flatnonzero(slots < self.size)
+        # When several rows pick the same slot the last one wins, as in the sequential algorithm
+        last = pd.Series(chosen, index=slots[chosen]).groupby(level=0).last()
+        self.rows.iloc[last.index.to_numpy()] = chunk.iloc[last.to_numpy()].to_numpy()
+        self.seen += len(chunk)
+
+
+# Function to estimate column statistics with 95% confidence intervals from a sample.
+# population is the number of rows the sample was drawn from without replacement, for the finite
+# population correction, or None when that is unknown. A sample of the whole population is exact:
+# its intervals read "exact" rather than having zero width.
+def approximate_statistics(sample, population=None):
+    rows = []
+    n = len(sample)
+    exact = population is not None and n >= population
+    correction = math.sqrt((population - n) / (population - 1)) if population and not exact else 1.0
+    for column in sample.columns:
+        values = pd.to_numeric(sample[column], errors="coerce").dropna().to_numpy(dtype=np.float64)
+        if not pd.api.types.is_numeric_dtype(sample[column]) or not values.size:
+            continue
+        count = values.size
+        mean = values.mean()
+        std = values.std(ddof=1) if count > 1 else math.nan
+        margin = Z_95 * std / math.sqrt(count) * correction if count > 1 else math.nan
+        ordered = np.sort(values)
+        row = {"column": column, "mean": mean, "mean 95% CI": "exact" if exact else f"± {margin:.4g}", "std": std}
+        for q in (0.25, 0.5, 0.75):
+            row[f"{int(q * 100)}%"] = np.quantile(values, q)
+            if exact:
+                row[f"{int(q * 100)}% 95% CI"] = "exact"
+                continue
+            # Order-statistic interval for the quantile from the binomial distribution,
+            # widened to take in both order statistics the estimate interpolates between
+            spread = Z_95 * math.sqrt(count * q * (1 - q)) * correction
+            low = ordered[max(0, math.floor(q * (count - 1) - spread))]
+            high = ordered[min(count - 1, math.ceil(q * (count - 1) + spread))]
+            row[f"{int(q * 100)}% 95% CI"] = f"[{low:.4g}, {high:.4g}]"
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+# Function to yield whole-file estimates that refine over time, as (statistics, status, finished).
+# The first estimate comes from lines at random offsets; a full pass then fills a uniform
+# reservoir sample, and each progress update reports the statistics of the rows read so far.
+def progressive_statistics(file_path, sample_size=DEFAULT_SAMPLE_SIZE, chunk_size=SAMPLING_CHUNK_SIZE,
+                           refresh_seconds=REFRESH_SECONDS):
+    quick_sample, estimated_rows, complete = random_line_sample(file_path, min(QUICK_SAMPLE_ROWS, sample_size))
+    if complete:
+        # Small enough to read whole: these are the statistics of every row
+        yield approximate_statistics(quick_sample, len(quick_sample)), f"Exact, from all {len(quick_sample)} rows.", True
+        return
+    # Offsets favour rows after long lines, so the sample is not uniform enough for a finite population correction
+    statistics = approximate_statistics(quick_sample)
+    yield statistics, f"Estimated from {len(quick_sample)} random rows of ~{estimated_rows} rows; refining...", False
+
+    reservoir = ReservoirSample(sample_size)
+    last_refresh = time.monotonic()
+    for chunk in iter_csv(file_path, chunk_size):
+        reservoir.update(chunk)
+        now = time.monotonic()
+        if now - last_refresh >= refresh_seconds:
+            last_refresh = now
+            progress = f"{reservoir.seen / estimated_rows:.0%}" if estimated_rows else f"{reservoir.seen} rows"
+            # A sample of the rows read so far, not yet of the whole file: no finite population correction
+            statistics = approximate_statistics(reservoir.rows)
+            yield statistics, (f"From a uniform sample of {len(reservoir.rows)} of the first {reservoir.seen} rows; "
+                               f"full pass at {progress}..."), False
+    if reservoir.rows is None:
+        yield statistics, "The file has no data rows.", True
+        return
+    statistics = approximate_statistics(reservoir.rows, reservoir.seen)
+    if len(reservoir.rows) >= reservoir.seen:
+        yield statistics, f"Exact, from all {reservoir.seen} rows.", True
+        return
+    yield statistics, f"From a uniform sample of {len(reservoir.rows)} of {reservoir.seen} rows.", True
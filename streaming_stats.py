@@ -0,0 +1,250 @@
+import math
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from csv_schema import get_schema, read_options
+
+# Rows read per chunk when streaming a CSV file
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Accuracy parameter of the KLL quantile sketch (about 1% rank error at 200)
+DEFAULT_SKETCH_K = 200
+
+# Distinct values tracked exactly for text columns before giving up on "unique"
+MAX_TRACKED_VALUES = 10_000
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+class KLLSketch:
+    """Mergeable KLL sketch for approximate quantiles in constant memory."""
+
+    def __init__(self, k=DEFAULT_SKETCH_K, seed=None):
+        self.k = k
+        self.count = 0
+        self.compactors = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if items.size >= self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind; the rest are halved into the next level
+                leftover = items[items.size - items.size % 2:]
+                paired = items[:items.size - leftover.size]
+                kept = paired[self.rng.integers(2)::2]
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], kept])
+                self.compactors[level] = leftover
+            level += 1
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.count += values.size
+            self.compactors[0] = np.concatenate([self.compactors[0], values])
+            self._compress()
+
+    def merge(self, other):
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.count += other.count
+        self._compress()
+
+    def _sorted_weights(self):
+        values = np.concatenate(self.compactors)
+        weights = np.concatenate([np.full(items.size, 2.0 ** level) for level, items in enumerate(self.compactors)])
+        order = np.argsort(values, kind="stable")
+        return values[order], np.cumsum(weights[order])
+
+    def quantiles(self, qs):
+        return weighted_quantiles(*self._sorted_weights(), qs)
+
+    # Quantiles of the absolute deviations from center, e.g. the MAD around the current median
+    def deviation_quantiles(self, center, qs):
+        values, cumulative = self._sorted_weights()
+        deviations = np.abs(values - center)
+        order = np.argsort(deviations, kind="stable")
+        return weighted_quantiles(deviations[order], np.cumsum(np.diff(cumulative, prepend=0.0)[order]), qs)
+
+    # Approximate fraction of the sketched values at or below each of the given values, or strictly
+    # below them; NaN stays NaN. Exact while nothing has been compacted.
+    def cdf(self, values, strict=False):
+        points, cumulative = self._sorted_weights()
+        values = np.asarray(values, dtype=np.float64)
+        if not points.size:
+            return np.full(values.shape, np.nan)
+        below = np.concatenate([[0.0], cumulative])[np.searchsorted(points, values, side="left" if strict else "right")]
+        return np.where(np.isnan(values), np.nan, below / cumulative[-1])
+
+
+# Function to interpolate quantiles linearly between sorted weighted items, like pandas. Each item sits
+# at the middle of the ranks it stands for, so the result is exact when every weight is one.
+def weighted_quantiles(values, cumulative, qs):
+    if not values.size:
+        return [math.nan for _ in qs]
+    weights = np.diff(cumulative, prepend=0.0)
+    ranks = cumulative - weights + (weights - 1) / 2
+    return np.interp(np.asarray(qs) * (cumulative[-1] - 1), ranks, values).tolist()
+
+
+class NumericSummary:
+    """Running count, mean, variance, min, max and quantile sketch of a numeric column."""
+
+    def __init__(self, sketch_k=DEFAULT_SKETCH_K):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = KLLSketch(sketch_k)
+
+    def _combine(self, count, mean, m2, minimum, maximum):
+        if not count:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+    def update(self, series):
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size:
+            mean = values.mean()
+            self._combine(values.size, mean, ((values - mean) ** 2).sum(), values.min(), values.max())
+            self.sketch.update(values)
+
+    def merge(self, other):
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        self.sketch.merge(other.sketch)
+
+    def describe(self):
+        if not self.count:
+            return {"count": 0}
+        std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+        q25, q50, q75 = self.sketch.quantiles(QUANTILES)
+        return {
+            "count": self.count, "mean": self.mean, "std": std, "min": self.min,
+            "25%": q25, "50%": q50, "75%": q75, "max": self.max,
+        }
+
+
+class CategoricalSummary:
+    """Count, distinct values and most frequent value of a text column."""
+
+    def __init__(self, max_tracked=MAX_TRACKED_VALUES):
+        self.count = 0
+        self.max_tracked = max_tracked
+        self.value_counts = Counter()
+        self.overflowed = False
+
+    def update(self, series):
+        values = series.dropna()
+        self.count += len(values)
+        if not self.overflowed:
+            self.value_counts.update(values.astype(str).value_counts().to_dict())
+            self._check_overflow()
+
+    def merge(self, other):
+        self.count += other.count
+        self.overflowed = self.overflowed or other.overflowed
+        if not self.overflowed:
+            self.value_counts.update(other.value_counts)
+            self._check_overflow()
+
+    def _check_overflow(self):
+        if len(self.value_counts) > self.max_tracked:
+            self.overflowed = True
+            self.value_counts.clear()
+
+    def describe(self):
+        if self.overflowed or not self.value_counts:
+            return {"count": self.count}
+        top, freq = self.value_counts.most_common(1)[0]
+        return {"count": self.count, "unique": len(self.value_counts), "top": top, "freq": freq}
+
+
+# Function to classify each column of a chunk as "numeric" or "text"
+def column_kinds(chunk):
+    return {
+        column: "numeric" if pd.api.types.is_numeric_dtype(chunk[column]) else "text"
+        for column in chunk.columns
+    }
+
+
+# Function to create empty summaries for the given column kinds
+def summaries_for(kinds):
+    return {
+        column: NumericSummary() if kind == "numeric" else CategoricalSummary()
+        for column, kind in kinds.items()
+    }
+
+
+# Function to create the summaries for a chunk's columns, numeric or text
+def new_summaries(chunk):
+    return summaries_for(column_kinds(chunk))
+
+
+# Function to fold one chunk into the running summaries
+def update_summaries(summaries, chunk):
+    for column, summary in summaries.items():
+        if column in chunk:
+            summary.update(chunk[column])
+
+
+# Function to merge summaries computed over different parts of the same file
+def merge_summaries(summaries, others):
+    for column, summary in others.items():
+        if column in summaries:
+            summaries[column].merge(summary)
+        else:
+            summaries[column] = summary
+    return summaries
+
+
+# Function to fold a sequence of chunks into fresh summaries; returns (summaries, preview)
+def summarize_chunks(chunks, preview_rows=5):
+    summaries = None
+    preview = None
+    for chunk in chunks:
+        if summaries is None:
+            summaries = new_summaries(chunk)
+            preview = chunk.head(preview_rows)
+        update_summaries(summaries, chunk)
+    return summaries or {}, preview if preview is not None else pd.DataFrame()
+
+
+# Function to stream a CSV file and summarise every column in constant memory
+def summarize_csv(file_path, chunk_size=DEFAULT_CHUNK_SIZE, preview_rows=5, schema=None):
+    schema = schema or get_schema(file_path)
+    try:
+        chunks = pd.read_csv(file_path, chunksize=chunk_size, **read_options(schema))
+        return summarize_chunks(chunks, preview_rows)
+    except (ValueError, OverflowError):
+        # Rows beyond the schema sample did not fit the inferred dtypes
+        chunks = pd.read_csv(file_path, chunksize=chunk_size, **read_options(schema, typed=False))
+        return summarize_chunks(chunks, preview_rows)
+
+
+# Function to lay out the summaries like DataFrame.describe()
+def describe_summaries(summaries):
+    numeric = {column: s.describe() for column, s in summaries.items() if isinstance(s, NumericSummary)}
+    if numeric:
+        return pd.DataFrame(numeric)
+    return pd.DataFrame({column: s.describe() for column, s in summaries.items()})
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from bm25_scorer import BM25FIndex, split_sections, tokenize
+
+VOCABULARY = [
+    "python", "java", "c++", "node.js", "sql", "spark", "docker", "kubernetes", "react", "aws",
+    "pandas", "django", "flask", "kafka", "airflow", "terraform", "go", "rust", "linux", "excel",
+]
+
+
+@pytest.fixture(scope="module")
+def index_and_queries():
+    rng = np.random.default_rng(0)
+    weights = 1 / np.arange(1, len(VOCABULARY) + 1)
+    weights /= weights.sum()
+    documents = []
+    for _ in range(400):
+        sections = []
+        for heading in ("Skills", "Experience", "Projects", "Hobbies"):
+            words = rng.choice(VOCABULARY, size=rng.integers(0, 15), p=weights)
+            sections.append(f"{heading}\n{' '.join(words)}")
+        documents.append("\n".join(sections))
+    queries = [" ".join(rng.choice(VOCABULARY, size=rng.integers(1, 6))) for _ in range(40)]
+    return BM25FIndex(documents), queries + ["python python sql", "unknownterm", ""]
+
+
+def exhaustive(index, query, k):
+    scores = index.score_all(query)
+    ranked = sorted(((score, doc_id) for doc_id, score in enumerate(scores) if score > 0), key=lambda item: (-item[0], item[1]))
+    return [(doc_id, score) for score, doc_id in ranked[:k]]
+
+
+@pytest.mark.parametrize("k", [1, 3, 10, 1000])
+def test_maxscore_matches_exhaustive_ranking(index_and_queries, k):
+    index, queries = index_and_queries
+    for query in queries:
+        found = index.search(query, k)
+        expected = exhaustive(index, query, k)
+        # Scores must agree exactly; ties may come back in either order
+        assert [score for _, score in found] == pytest.approx([score for _, score in expected])
+        scores = index.score_all(query)
+        for doc_id, score in found:
+            assert scores[doc_id] == pytest.approx(score)
+
+
+def test_search_with_no_results(index_and_queries):
+    index, _ = index_and_queries
+    assert index.search("python", 0) == []
+    assert index.search("unknownterm", 5) == []
+
+
+def test_tokenize_keeps_technical_terms():
+    assert tokenize("C++, C# and Node.js developer; Straße") == ["c++", "c#", "node.js", "developer", "straße"]
+
+
+def test_split_sections():
+    sections = split_sections("Jane Doe\nSkills:\npython\nWork Experience\nacme corp")
+    assert sections == {"other": "Jane Doe", "skills": "python", "experience": "acme corp"}
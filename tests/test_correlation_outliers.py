@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlation_outliers import ROBUST_Z_THRESHOLD, CorrelationOutlierAnalyzer
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=150)
+    return pd.DataFrame({
+        "x": x,
+        "y": np.exp(x) + rng.normal(0, 0.1, 150),
+        # Heavy ties, where ranks must be mid-ranks to match pandas
+        "level": rng.integers(0, 4, 150),
+        "spiky": np.append(rng.normal(size=145), [15, -12, 20, 30, -25]),
+    })
+
+
+def chunks_of(frame, size=40):
+    return lambda: (frame.iloc[start:start + size] for start in range(0, len(frame), size))
+
+
+def expected_outliers(values):
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = int(((values < q1 - 1.5 * (q3 - q1)) | (values > q3 + 1.5 * (q3 - q1))).sum())
+    mad = np.median(np.abs(values - median))
+    robust = int((np.abs(0.6745 * (values - median) / mad) > ROBUST_Z_THRESHOLD).sum())
+    return median, mad, iqr, robust
+
+
+def test_small_file_matches_pandas_exactly(frame):
+    analyzer = CorrelationOutlierAnalyzer(frame.columns).fit(chunks_of(frame))
+    np.testing.assert_allclose(analyzer.pearson(), frame.corr(), atol=1e-12)
+    np.testing.assert_allclose(analyzer.spearman(), frame.corr(method="spearman"), atol=1e-12)
+    report = analyzer.outliers()
+    for column in frame.columns:
+        median, mad, iqr, robust = expected_outliers(frame[column].to_numpy(dtype=np.float64))
+        assert report.loc[column, "median"] == pytest.approx(median)
+        assert report.loc[column, "MAD"] == pytest.approx(mad)
+        assert report.loc[column, "IQR outliers"] == iqr
+        assert report.loc[column, "robust z outliers"] == robust
+    assert set(report["counts"]) == {"estimated"}
+
+
+def test_large_file_is_close_to_pandas():
+    rng = np.random.default_rng(4)
+    x = rng.normal(size=60_000)
+    frame = pd.DataFrame({"x": x, "y": x ** 3 + rng.normal(size=60_000), "z": rng.integers(0, 10, 60_000)})
+    analyzer = CorrelationOutlierAnalyzer(frame.columns, sample_size=20_000, seed=0).fit(chunks_of(frame, 7000), exact_counts=True)
+    np.testing.assert_allclose(analyzer.spearman(), frame.corr(method="spearman"), atol=0.03)
+    report = analyzer.outliers()
+    assert set(report["counts"]) == {"exact"}
+    median, mad, _, _ = expected_outliers(frame["x"].to_numpy())
+    assert report.loc["x", "median"] == pytest.approx(median, abs=0.05)
+    assert report.loc["x", "MAD"] == pytest.approx(mad, rel=0.05)
+
+
+def test_append_matches_fit_of_all_rows(frame):
+    appended = CorrelationOutlierAnalyzer(frame.columns).fit(chunks_of(frame.iloc[:60]))
+    for start in range(60, len(frame), 30):
+        appended.append(frame.iloc[start:start + 30])
+    fitted = CorrelationOutlierAnalyzer(frame.columns).fit(chunks_of(frame))
+    np.testing.assert_allclose(appended.pearson(), fitted.pearson(), atol=1e-12)
+    np.testing.assert_allclose(appended.spearman(), fitted.spearman(), atol=1e-12)
+    pd.testing.assert_frame_equal(appended.outliers(), fitted.outliers())
+
+
+def test_append_after_exact_counts_tracks_stale_rows(frame):
+    analyzer = CorrelationOutlierAnalyzer(frame.columns).fit(chunks_of(frame.iloc[:100]), exact_counts=True)
+    analyzer.append(frame.iloc[100:])
+    assert (analyzer.outliers()["rows counted with older fences"] == 100).all()
+    analyzer.recount(chunks_of(frame))
+    report = analyzer.outliers()
+    assert (report["rows counted with older fences"] == 0).all()
+    for column in frame.columns:
+        _, _, iqr, robust = expected_outliers(frame[column].to_numpy(dtype=np.float64))
+        assert (report.loc[column, "IQR outliers"], report.loc[column, "robust z outliers"]) == (iqr, robust)
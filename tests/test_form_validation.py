@@ -0,0 +1,44 @@
+import pandas as pd
+
+from form_validation import PROJECT_SCHEMA, RESUME_BUILDER_SCHEMA, ColumnValidator, Validator
+
+SCHEMA = {
+    "code": {"label": "Code", "pattern": r"[A-Z]{3}", "date": True, "suffixes": (".x",)},
+    "name": {"label": "Name", "required": True, "min_length": 2, "max_length": 5},
+}
+
+
+def test_each_rule_keeps_its_own_message():
+    errors = Validator(SCHEMA).validate({"code": "abc", "name": "n"})
+    assert errors == [
+        "Code has an invalid format.",
+        "Code must be MM/DD/YYYY or MM/YYYY.",
+        "Code must end with one of: .x.",
+        "Name must be at least 2 characters.",
+    ]
+
+
+def test_column_validator_matches_validator():
+    records = [
+        {"code": "abc", "name": "n"},
+        {"code": "", "name": "toolong"},
+        {"code": None, "name": None},
+        {"first_name": "x" * 300},
+    ]
+    for schema in (SCHEMA, RESUME_BUILDER_SCHEMA, PROJECT_SCHEMA):
+        validator, column_validator = Validator(schema), ColumnValidator(schema)
+        expected = ["; ".join(validator.validate(record)) for record in records]
+        assert column_validator.validate(pd.DataFrame(records)).tolist() == expected
+
+
+def test_placeholders_and_dates():
+    validator = Validator(RESUME_BUILDER_SCHEMA)
+    errors = validator.validate({
+        "first_name": "Jane", "last_name": "Doe", "employee_id": "E1", "mobile_number": "12345",
+        "country": "Select Country", "state": "Karnataka", "city": "Bengaluru",
+    })
+    assert errors == ["Invalid mobile number! Must be 10 digits.", "Country is required."]
+    assert Validator(PROJECT_SCHEMA).validate({
+        "project_name": "p", "project_description": "d", "tools_used": "t", "roles": "r",
+        "start_date": "02/29/2024", "end_date": "01/2024",
+    }) == ["End Date must not be before Start Date."]
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from group_aggregation import GroupAggregator, aggregate_chunks
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(8)
+    rows = 20_000
+    frame = pd.DataFrame({
+        "city": rng.choice(["Pune", "Delhi", "Goa", None], rows),
+        "year": rng.integers(2000, 2024, rows),
+        # Wide integer keys, whose codes would overflow int64 if packed arithmetically
+        "account": rng.integers(0, 2 ** 62, rows) % 3000 * 3_074_457_345_618_258,
+        "amount": rng.normal(100, 20, rows),
+    })
+    frame.loc[frame.sample(frac=0.05, random_state=1).index, "amount"] = np.nan
+    return frame
+
+
+def chunks(frame, size=1700):
+    return (frame.iloc[start:start + size] for start in range(0, len(frame), size))
+
+
+@pytest.mark.parametrize("keys", [["city"], ["city", "year"], ["year", "account", "city"]])
+def test_matches_pandas_groupby(frame, keys):
+    result = aggregate_chunks(chunks(frame), keys, ["amount"])
+    expected = frame.groupby(keys)["amount"].agg(["count", "sum", "mean", "std", "min", "max"])
+    expected.columns = pd.MultiIndex.from_product([["amount"], expected.columns])
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_exact=False, rtol=1e-9)
+
+
+def test_keys_of_changing_dtypes_meet_in_one_group():
+    first = pd.DataFrame({"kind": pd.Categorical(["a", "b"]), "value": [1.0, 2.0]})
+    second = pd.DataFrame({"kind": pd.Categorical(["c", "a"]), "value": [3.0, 4.0]})
+    result = aggregate_chunks([first, second], ["kind"], ["value"], ["count", "sum"])
+    assert result[("value", "sum")].to_dict() == {"a": 5.0, "b": 2.0, "c": 3.0}
+
+
+def test_memory_budget_limits_groups():
+    aggregator = GroupAggregator(["key"], ["value"], memory_budget_mb=0.001)
+    with pytest.raises(MemoryError):
+        aggregator.update(pd.DataFrame({"key": range(100), "value": 1.0}))
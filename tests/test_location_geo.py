@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from location_geo import CityGrid, haversine_km
+
+
+@pytest.fixture(scope="module")
+def grid():
+    rng = np.random.default_rng(42)
+    # Clustered cities plus a few near the poles and the antimeridian
+    centres = rng.uniform([-60, -180], [70, 180], size=(40, 2))
+    cities = centres[rng.integers(0, len(centres), 3000)] + rng.normal(0, 1.5, size=(3000, 2))
+    edges = np.array([[89.5, 10.0], [-89.7, -170.0], [10.0, 179.9], [10.0, -179.9], [-45.0, 180.0 - 1e-9]])
+    cities = np.vstack([cities, edges])
+    cities[:, 0] = np.clip(cities[:, 0], -90, 90)
+    cities[:, 1] = (cities[:, 1] + 180) % 360 - 180
+    return CityGrid(SimpleNamespace(latitudes=cities[:, 0], longitudes=cities[:, 1]), cell_degrees=2.0)
+
+
+def brute_distances(grid, latitude, longitude):
+    return haversine_km(latitude, longitude, grid.index.latitudes, grid.index.longitudes)
+
+
+@pytest.fixture(scope="module")
+def points():
+    rng = np.random.default_rng(1)
+    random_points = np.column_stack([rng.uniform(-90, 90, 60), rng.uniform(-180, 180, 60)])
+    edges = np.array([[10.0, 180.0], [10.0, -180.0], [90.0, 0.0], [-90.0, 0.0], [0.0, 0.0]])
+    return np.vstack([random_points, edges])
+
+
+@pytest.mark.parametrize("radius_km", [1.0, 150.0, 900.0, 5000.0])
+def test_within_radius_matches_brute_force(grid, points, radius_km):
+    for latitude, longitude in points:
+        positions, distances = grid.within_radius(latitude, longitude, radius_km)
+        expected = brute_distances(grid, latitude, longitude)
+        assert set(positions.tolist()) == set(np.flatnonzero(expected <= radius_km).tolist())
+        np.testing.assert_allclose(distances, expected[positions])
+        assert np.all(np.diff(distances) >= 0)
+
+
+@pytest.mark.parametrize("k", [1, 5, 50])
+def test_nearest_matches_brute_force(grid, points, k):
+    for latitude, longitude in points:
+        positions, distances = grid.nearest(latitude, longitude, k)
+        expected = np.sort(brute_distances(grid, latitude, longitude))[:k]
+        np.testing.assert_allclose(distances, expected)
+
+
+def test_nearest_many_matches_brute_force(grid, points):
+    positions, distances = grid.nearest_many(points[:, 0], points[:, 1])
+    for (latitude, longitude), position, distance in zip(points, positions, distances):
+        expected = brute_distances(grid, latitude, longitude)
+        assert distance == pytest.approx(expected.min())
+        assert expected[position] == pytest.approx(expected.min())
+
+
+def test_nearest_many_grouped_search(grid, monkeypatch):
+    # Force the per-cell search that is used when there are many more cities than points
+    monkeypatch.setattr("location_geo.GROUP_SEARCH_PAIRS", 0)
+    rng = np.random.default_rng(9)
+    latitudes, longitudes = rng.uniform(-90, 90, 300), rng.uniform(-180, 180, 300)
+    _, distances = grid.nearest_many(latitudes, longitudes)
+    expected = haversine_km(latitudes[:, None], longitudes[:, None],
+                            grid.index.latitudes[None, :], grid.index.longitudes[None, :]).min(axis=1)
+    np.testing.assert_allclose(distances, expected)
+
+
+def test_haversine_known_distance():
+    # Paris to London, about 344 km
+    assert haversine_km(48.8566, 2.3522, 51.5074, -0.1278) == pytest.approx(343.5, abs=1.0)
+    assert haversine_km(0, 179.5, 0, -179.5) == pytest.approx(111.2, abs=0.2)
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from project_dates import NO_DAY, ProjectTimeline, experience_months, month_number, parse_date, parse_dates, project_months
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("01/2020", (month_number(2020, 1), None)),
+    (" 12/2020 ", (month_number(2020, 12), None)),
+    ("01/01/1970", (month_number(1970, 1), 0)),
+    ("12/31/1969", (month_number(1969, 12), -1)),
+    ("02/29/2024", (month_number(2024, 2), 19782)),
+])
+def test_parse_date(text, expected):
+    assert parse_date(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "02/29/2023", "02/30/2024", "04/31/2024", "13/2020", "00/2020", "1/2020", "2020-01-01", "01/2020/05", "", None,
+])
+def test_parse_date_rejects(text):
+    with pytest.raises(ValueError):
+        parse_date(text)
+
+
+def test_parse_dates_matches_parse_date():
+    values = ["01/2020", "02/29/2024", "02/29/2023", None, "", " 12/31/1999", "13/01/2020", "06/15/0001", "x"]
+    months, days, valid = parse_dates(values)
+    for value, month, day, ok in zip(values, months, days, valid):
+        try:
+            expected_month, expected_day = parse_date(value)
+        except ValueError:
+            assert not ok
+            assert (month, day) == (0, 0)
+            continue
+        assert ok
+        assert month == expected_month
+        assert day == (NO_DAY if expected_day is None else expected_day)
+
+
+def test_parse_dates_empty():
+    months, days, valid = parse_dates([])
+    assert len(months) == len(days) == len(valid) == 0
+
+
+def test_project_months_counts_both_ends_and_open_projects():
+    today = month_number(2024, 6)
+    starts = [month_number(2024, 1), month_number(2024, 3), month_number(2024, 5)]
+    ends = [month_number(2024, 1), None, -1]
+    assert project_months(starts, ends, today).tolist() == [1, 4, 2]
+
+
+def test_experience_months_counts_overlaps_once():
+    today = month_number(2024, 12)
+    starts = [month_number(2020, 1), month_number(2020, 6), month_number(2022, 1), month_number(2020, 2)]
+    ends = [month_number(2020, 12), month_number(2021, 3), month_number(2022, 1), month_number(2020, 3)]
+    assert experience_months(starts, ends, today) == 15 + 1
+    assert experience_months([], [], today) == 0
+    # Brute force over the months covered
+    covered = set()
+    for start, end in zip(starts, ends):
+        covered.update(range(start, end + 1))
+    assert experience_months(starts, ends, today) == len(covered)
+    assert experience_months(np.array(starts[::-1]), ends[::-1], today) == len(covered)
+
+
+def test_timeline_overlapping_matches_brute_force():
+    rng = np.random.default_rng(6)
+    today = month_number(2024, 12)
+    starts = rng.integers(month_number(2010, 1), today, 300)
+    ends = [None if rng.random() < 0.1 else int(start + rng.integers(0, 40)) for start in starts]
+    timeline = ProjectTimeline(starts, ends, today)
+    last = starts + project_months(starts, ends, today) - 1
+    for first_month, last_month in rng.integers(month_number(2009, 1), today + 12, (200, 2)):
+        first_month, last_month = sorted((first_month, last_month))
+        expected = np.flatnonzero((starts <= last_month) & (last >= first_month))
+        assert timeline.overlapping(first_month, last_month).tolist() == expected.tolist()
+    assert timeline.active_in(today).tolist() == np.flatnonzero(last >= today).tolist()
@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+import resume_location
+from location_geo import CityGrid
+from locations import build_location_index
+from resume_location import PlaceNames, detect_location
+
+CITIES = pd.DataFrame(
+    [
+        ("India", "Maharashtra", "Pune", 18.52, 73.86),
+        ("India", "Tamil Nadu", "Salem", 11.66, 78.15),
+        ("India", "Karnataka", "Bengaluru", 12.97, 77.59),
+        ("USA", "Oregon", "Salem", 44.94, -123.04),
+        ("USA", "Alabama", "Mobile", 30.69, -88.04),
+    ],
+    columns=["country", "State", "City", "Lat", "Long"],
+)
+
+
+@pytest.fixture(autouse=True)
+def small_index(monkeypatch):
+    index = build_location_index(CITIES)
+    monkeypatch.setattr(resume_location, "get_place_names", lambda: PlaceNames(index))
+    monkeypatch.setattr(resume_location, "get_city_grid", lambda: CityGrid(index))
+
+
+def located(text):
+    location = detect_location(text)
+    return location["country"], location["state"], location["city"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    # A bare city name that is also an ordinary word is not a location
+    ("Jane Doe\nMobile: 9876543210", (None, None, None)),
+    ("Worked at the Salem plant", (None, None, None)),
+    # City with its state or country, or on a location line
+    ("Jane Doe\nPune, Maharashtra", ("India", "Maharashtra", "Pune")),
+    ("Salem, USA", ("USA", "Oregon", "Salem")),
+    ("Salem, Tamil Nadu", ("India", "Tamil Nadu", "Salem")),
+    ("Address: 12 MG Road, Bengaluru", ("India", "Karnataka", "Bengaluru")),
+    ("Mobile: 98765\nLocation: Mobile, Alabama", ("USA", "Alabama", "Mobile")),
+    # A location line naming another country does not confirm the city
+    ("Location: Pune, USA", (None, None, None)),
+    # States only count on a location line or next to their country
+    ("Karnataka, India", ("India", "Karnataka", None)),
+    ("Projects across Karnataka", (None, None, None)),
+    ("Based in Oregon", ("USA", "Oregon", None)),
+])
+def test_detect_location(text, expected):
+    assert located(text) == expected
+
+
+def test_detected_city_carries_coordinates_and_cell():
+    location = detect_location("Location: Pune")
+    assert (location["latitude"], location["longitude"]) == pytest.approx((18.52, 73.86))
+    assert location["location_cell"] is not None
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlation_outliers import CorrelationAccumulator
+from csv_schema import get_schema
+from streaming_stats import KLLSketch, NumericSummary, describe_summaries, summarize_csv
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        "normal": rng.normal(10, 3, 5000),
+        "skewed": rng.exponential(2.0, 5000),
+        "small": rng.integers(0, 5, 5000),
+        "label": rng.choice(["a", "b", "c"], 5000),
+    })
+
+
+def test_streaming_describe_matches_pandas(tmp_path, frame):
+    path = tmp_path / "frame.csv"
+    frame.to_csv(path, index=False)
+    schema = get_schema(str(path), cache_dir=str(tmp_path / "schemas"))
+    summaries, preview = summarize_csv(str(path), chunk_size=700, schema=schema)
+    described = describe_summaries(summaries)
+    expected = pd.read_csv(path).describe()
+    assert list(described.columns) == list(expected.columns)
+    # The inferred schema reads decimals as float32, so agreement is to float32 precision
+    for stat in ("count", "mean", "std", "min", "max"):
+        np.testing.assert_allclose(described.loc[stat], expected.loc[stat], rtol=1e-6)
+    # Quartiles come from the sketch: within its rank error of the exact ones
+    for column in expected.columns:
+        values = np.sort(frame[column].to_numpy(dtype=np.float64))
+        for stat, q in (("25%", 0.25), ("50%", 0.5), ("75%", 0.75)):
+            # Repeated values span a range of ranks; q has to fall within the error of that range
+            estimate = described.loc[stat, column]
+            low = np.searchsorted(values, estimate, side="left") / len(values)
+            high = np.searchsorted(values, estimate, side="right") / len(values)
+            assert low - 0.02 <= q <= high + 0.02
+    assert len(preview) == 5
+
+
+def test_kll_is_exact_before_compaction():
+    values = np.arange(100, dtype=np.float64)
+    sketch = KLLSketch(k=200, seed=1)
+    sketch.update(values)
+    assert sketch.quantiles([0.25, 0.5, 0.75]) == pytest.approx(np.quantile(values, [0.25, 0.5, 0.75]).tolist())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_kll_rank_error(seed):
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(0, 1, 200_000)
+    sketch = KLLSketch(k=200, seed=seed)
+    for chunk in np.array_split(values, 37):
+        sketch.update(chunk)
+    ordered = np.sort(values)
+    qs = np.linspace(0.01, 0.99, 99)
+    ranks = np.searchsorted(ordered, sketch.quantiles(qs)) / len(values)
+    assert np.max(np.abs(ranks - qs)) <= 0.02
+    assert sketch.count == len(values)
+
+
+def test_kll_merge_keeps_rank_error():
+    rng = np.random.default_rng(3)
+    parts = [rng.normal(size=30_000) for _ in range(6)]
+    sketches = []
+    for seed, part in enumerate(parts):
+        sketch = KLLSketch(k=200, seed=seed)
+        sketch.update(part)
+        sketches.append(sketch)
+    merged = sketches[0]
+    for other in sketches[1:]:
+        merged.merge(other)
+    values = np.sort(np.concatenate(parts))
+    qs = np.array([0.1, 0.25, 0.5, 0.75, 0.9])
+    ranks = np.searchsorted(values, merged.quantiles(qs)) / len(values)
+    assert np.max(np.abs(ranks - qs)) <= 0.02
+
+
+def test_numeric_summary_merge_matches_single_pass():
+    rng = np.random.default_rng(11)
+    # A large offset makes naive sum-of-squares variance lose precision; Chan's merge does not
+    values = 1e9 + rng.normal(0, 1, 10_000)
+    whole = NumericSummary()
+    whole.update(pd.Series(values))
+    merged = NumericSummary()
+    for part in np.array_split(values, [1, 17, 4000, 9999]):
+        summary = NumericSummary()
+        summary.update(pd.Series(part))
+        merged.merge(summary)
+    expected = pd.Series(values).describe()
+    for summary in (whole, merged):
+        described = summary.describe()
+        assert described["count"] == len(values)
+        assert described["mean"] == pytest.approx(expected["mean"], rel=1e-12)
+        assert described["std"] == pytest.approx(expected["std"], rel=1e-6)
+        assert (described["min"], described["max"]) == (expected["min"], expected["max"])
+
+
+def test_numeric_summary_merge_with_empty():
+    summary = NumericSummary()
+    summary.update(pd.Series([1.0, 2.0, 3.0]))
+    summary.merge(NumericSummary())
+    empty = NumericSummary()
+    empty.merge(summary)
+    assert empty.describe()["mean"] == 2.0
+    assert empty.describe()["std"] == pytest.approx(1.0)
+
+
+def test_correlation_accumulator_matches_numpy():
+    rng = np.random.default_rng(5)
+    x = rng.normal(size=3000)
+    matrix = np.column_stack([x, 2 * x + rng.normal(size=3000), rng.normal(size=3000)])
+    matrix[::50, 1] = np.nan
+    accumulator = CorrelationAccumulator(3)
+    for chunk in np.array_split(matrix, 13):
+        accumulator.update(chunk)
+    complete = matrix[~np.isnan(matrix).any(axis=1)]
+    assert accumulator.count == len(complete)
+    np.testing.assert_allclose(accumulator.correlation(), np.corrcoef(complete, rowvar=False), atol=1e-12)